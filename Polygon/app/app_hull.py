@@ -1,12 +1,13 @@
 """
     Application to construct a convex hull for points being added.
+    The hull is updated incrementally as each point arrives.
 
     Right-click to refresh
 """
 
 from poly.polygon import Polygon
 from poly.point import Point
-from hull.convex import computeHull
+from hull.incremental import IncrementalHull
 from tkinter import Tk, Canvas, ALL
 
 class HullApp():
@@ -16,8 +17,9 @@ class HullApp():
         master.title("Left press to add point to polygon. Right press to start new one.")
         self.master = master 
         
-        # keep track of points being created
+        # keep track of points being created, and their hull
         self.points = []
+        self.hull = IncrementalHull()
         
         self.canvas = Canvas(master, width=512, height=512)        
         self.canvas.bind("<Button-1>", self.add)
@@ -34,19 +36,22 @@ class HullApp():
          
     def add(self, event):
         """Add point to polygon and redraw."""
-        self.points.append (Point(event.x, self.toCartesian(event.y)))
+        pt = Point(event.x, self.toCartesian(event.y))
+        self.points.append (pt)
+        self.hull.add (pt)
         self.visit()
 
     def clear(self, event):
         """Clear all polygons and start again."""
         self.points = []
+        self.hull = IncrementalHull()
         self.visit()
 
     def visit (self):
         """Visit structure and represent graphically."""
         self.canvas.delete(ALL)
 
-        p = computeHull(self.points)
+        p = self.hull.hull()
         if p.valid():
             # create single list of (x,y) coordinates
             full = [None] * 2 * p.numEdges()
@@ -7,10 +7,12 @@
     with left clicks.
 
     When polygon is added, intersection tests are performed
-    by comparing edges.
+    by comparing edges, but only for pairs of polygons whose
+    bounding boxes overlap according to a spatial index.
 """
 
 from poly.polygon import Polygon
+from poly.spatial import GridIndex
 from tkinter import Tk, Canvas, ALL
 
 class PolygonApp():
@@ -57,16 +59,14 @@ class PolygonApp():
         self.canvas.delete(ALL)
         n = len(self.polygons)
 
-        # check intersection with all polygons
+        # check intersection with polygons whose bounds overlap
         colors = [ 'black' ] * n
-        for i in range(n-1):
-            p = self.polygons[i]
-            for j in range(i+1, n):
-                q = self.polygons[j]
-
-                if p.valid() and q.valid():
-                    if p.intersect(q):
-                        colors[i] = colors[j] = 'red'
+        index = GridIndex()
+        index.load((i, p.bounds()) for i, p in enumerate(self.polygons)
+                   if p.valid())
+        for (i, j) in index.pairs():
+            if self.polygons[i].intersect(self.polygons[j]):
+                colors[i] = colors[j] = 'red'
         
         # now draw all
         for i in range(n-1,-1,-1):
@@ -7,7 +7,7 @@
 from poly.polygon import Polygon
 from poly.point import Point
 from hull.convex import computeHull,computeRandom
-from poly.convex_intersect import convexIntersect
+from poly.convex_intersect import ConvexIntersector
 from tkinter import Tk, Canvas, ALL
 
 
@@ -25,6 +25,7 @@ class MovePolygonAnimation():
         
         self.p1 = p1
         self.p2 = p2
+        self.intersector = ConvexIntersector()
         
         self.canvas = Canvas(master, width=512, height=512)        
         self.canvas.bind("<Button-1>", self.switch)
@@ -44,16 +45,14 @@ class MovePolygonAnimation():
 
     def track(self, event):
         """Refresh event collection and redraw."""
-        anchor = self.p1.get(0)
-        deltax = event.x - anchor.x()
-        deltay = self.toCartesian(event.y) - anchor.y()
-        for p in self.p1:
-            p.set(p.x() + deltax, p.y() + deltay)
+        x, y = self.p1.getCoordinates(0)
+        self.p1.translate(event.x - x, self.toCartesian(event.y) - y)
 
     def switch(self, event):
         """create two new polygons to use."""
         self.p1 = computeRandom(50, 250, 300, 500)
         self.p2 = computeRandom(50, 250, 300, 500)
+        self.intersector.reset()
 
     def drawEverything(self):
         """Draw at timed frequency."""
@@ -62,7 +61,7 @@ class MovePolygonAnimation():
         self.canvas.delete(ALL)
         self.drawPolygon(self.p1, 'blue', '')
         self.drawPolygon(self.p2, 'black', '')
-        intersect = convexIntersect(self.p1, self.p2)
+        intersect = self.intersector.intersect(self.p1, self.p2)
         self.drawPolygon(intersect, '', 'red')
 
     def drawPolygon(self, p, outline, fill):
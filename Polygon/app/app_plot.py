@@ -2,6 +2,13 @@
     Application to plot two polygons drawn from two input files
     and to compute their intersection.
 
+      python3 app_plot.py first.wkt second.geojson
+
+    Files are read as GeoJSON if their name ends with .json or .geojson,
+    otherwise as WKT; the first polygon of each is shown. Given a single
+    file, its first two polygons are shown. Given four numbers instead,
+    random polygons are drawn within (v1,v1)-(v2,v2) and (v3,v3)-(v4,v4).
+
     Right-click to refresh
 """
 import sys
@@ -10,6 +17,8 @@ from poly.polygon import Polygon
 from poly.point import Point
 from hull.convex import computeHull,computeRandom
 from poly.convex_intersect import convexIntersect
+from poly.textformat import readPolygons
+from itertools import islice
 from tkinter import Tk, Canvas, ALL
 
 # default values for regions where random polygons are constructed
@@ -92,15 +101,26 @@ class IntersectingPolygons():
             self.intersection = None
             
 if __name__ == '__main__':
-    # generate two random polygons
-    if len(sys.argv) >= 4:
-        v1 = int(sys.argv[1])
-        v2 = int(sys.argv[2])
-        v3 = int(sys.argv[3])
-        v4 = int(sys.argv[4])
+    if len(sys.argv) == 2:
+        polygons = list(islice(readPolygons(sys.argv[1]), 2))
+        if len(polygons) < 2:
+            sys.exit('{} holds fewer than two polygons'.format(sys.argv[1]))
+        p1, p2 = polygons
+    elif len(sys.argv) == 3:
+        p1 = next(readPolygons(sys.argv[1]), None)
+        p2 = next(readPolygons(sys.argv[2]), None)
+        if p1 is None or p2 is None:
+            sys.exit('no polygon found in input files')
+    else:
+        # generate two random polygons
+        if len(sys.argv) >= 5:
+            v1 = int(sys.argv[1])
+            v2 = int(sys.argv[2])
+            v3 = int(sys.argv[3])
+            v4 = int(sys.argv[4])
 
-    p1 = computeRandom(v1, v1, v2, v2)
-    p2 = computeRandom(v3, v3, v4, v4)
+        p1 = computeRandom(v1, v1, v2, v2)
+        p2 = computeRandom(v3, v3, v4, v4)
 
     root = Tk()
     app = IntersectingPolygons(root, p1, p2)
@@ -0,0 +1,196 @@
+"""
+    Benchmarks for hull, intersection and convexity code.
+
+    Times computeHull, convexIntersect, Polygon.intersect, Polygon.simple
+    and Polygon.convex over seeded inputs of increasing size, and writes
+    the results as JSON. Each result records the best of several runs,
+    the throughput in input points per second, and the peak memory
+    allocated while running, as traced by tracemalloc in a separate run.
+
+    Run from the directory containing the 'poly' and 'hull' packages:
+
+      python3 -m bench.benchmark --output results.json
+
+    Compare against an earlier run, failing if anything became slower
+    than the tolerance allows:
+
+      python3 -m bench.benchmark --baseline results.json --tolerance 1.25
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from poly.point import Point
+from poly.polygon import Polygon
+from poly.convex_intersect import convexIntersect
+from hull.convex import computeHull
+
+def convexPolygon(rng, h, cx, cy, r):
+    """Regular polygon with h vertices around (cx,cy), randomly rotated."""
+    start = rng.uniform(0, 2*math.pi)
+    return Polygon([Point(cx + r*math.cos(start + 2*math.pi*i/h),
+                          cy + r*math.sin(start + 2*math.pi*i/h))
+                    for i in range(h)])
+
+def starPolygon(rng, n, r):
+    """Simple, star-shaped polygon with n vertices around the origin."""
+    angles = sorted(rng.uniform(0, 2*math.pi) for i in range(n))
+    pts = []
+    for a in angles:
+        d = rng.uniform(r/2, r)
+        pts.append(Point(d*math.cos(a), d*math.sin(a)))
+    return Polygon(pts)
+
+def hullPoints(rng, n, config):
+    """Random points in a square, in a disk or on a circle."""
+    pts = []
+    for i in range(n):
+        if config == 'square':
+            pts.append(Point(rng.uniform(0, 1E6), rng.uniform(0, 1E6)))
+        else:
+            a = rng.uniform(0, 2*math.pi)
+            d = 1E6
+            if config == 'disk':
+                d *= math.sqrt(rng.random())
+            pts.append(Point(d*math.cos(a), d*math.sin(a)))
+    return pts
+
+def polygonPair(rng, h, config):
+    """Two convex polygons with h vertices that are disjoint, overlap or nest."""
+    r = 1E6
+    p = convexPolygon(rng, h, 0, 0, r)
+    if config == 'disjoint':
+        q = convexPolygon(rng, h, 3*r, r, r)
+    elif config == 'overlapping':
+        q = convexPolygon(rng, h, r, r/2, r)
+    else:
+        q = convexPolygon(rng, h, r/10, 0, r/3)
+    return (p, q)
+
+def cases(maxPoints, maxVertices):
+    """Generate (name, size, config, make) for each benchmark case."""
+    sizes = [10**k for k in range(1, 7) if 10**k <= maxPoints]
+    for config in ['square', 'disk', 'circle']:
+        for n in sizes:
+            yield ('computeHull', n, config,
+                   lambda rng, n=n, config=config: (computeHull, (hullPoints(rng, n, config),)))
+
+    vertices = [3] + [10**k for k in range(1, 6) if 10**k <= maxVertices]
+    for config in ['disjoint', 'overlapping', 'nested']:
+        for h in vertices:
+            yield ('convexIntersect', 2*h, config,
+                   lambda rng, h=h, config=config: (convexIntersect, polygonPair(rng, h, config)))
+            yield ('Polygon.intersect', 2*h, config,
+                   lambda rng, h=h, config=config: (Polygon.intersect, polygonPair(rng, h, config)))
+
+    for h in vertices:
+        yield ('Polygon.simple', h, 'convex',
+               lambda rng, h=h: (Polygon.simple, (convexPolygon(rng, h, 0, 0, 1E6),)))
+        yield ('Polygon.simple', h, 'star',
+               lambda rng, h=h: (Polygon.simple, (starPolygon(rng, h, 1E6),)))
+        yield ('Polygon.convex', h, 'convex',
+               lambda rng, h=h: (Polygon.convex, (convexPolygon(rng, h, 0, 0, 1E6),)))
+
+def measure(name, size, config, make, seed, repeat):
+    """
+    Time one case and return its result as a dictionary. Inputs are
+    built afresh, from the same seed, for every run, so that no run
+    finds caches such as Polygon's edges already filled in by another.
+    """
+    key = '{}:{}:{}:{}'.format(seed, name, size, config)
+
+    best = None
+    for i in range(repeat):
+        func, args = make(random.Random(key))
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    func, args = make(random.Random(key))
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'benchmark': name,
+            'size': size,
+            'config': config,
+            'seconds': best,
+            'throughput': size / best if best > 0 else None,
+            'peakBytes': peak}
+
+def run(seed=0, maxPoints=10**6, maxVertices=10**5, repeat=3, only=None, log=None):
+    """Run all benchmark cases and return report as a dictionary."""
+    results = []
+    for name, size, config, make in cases(maxPoints, maxVertices):
+        if only and name not in only:
+            continue
+        result = measure(name, size, config, make, seed, repeat)
+        if log:
+            log.write('{:18} {:12} {:>8} {:10.6f}s\n'.format(
+                name, config, size, result['seconds']))
+        results.append(result)
+
+    return {'seed': seed,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results}
+
+def compare(report, baseline, tolerance):
+    """Return list of results more than tolerance times slower than baseline."""
+    before = {}
+    for r in baseline['results']:
+        before[(r['benchmark'], r['size'], r['config'])] = r['seconds']
+
+    slower = []
+    for r in report['results']:
+        old = before.get((r['benchmark'], r['size'], r['config']))
+        if old and r['seconds'] > old * tolerance:
+            slower.append((r, r['seconds'] / old))
+    return slower
+
+def main(args=None):
+    """Parse command-line arguments and run benchmarks."""
+    parser = argparse.ArgumentParser(description='Benchmark hull and intersection code.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-points', type=int, default=10**6,
+                        help='largest number of points for computeHull')
+    parser.add_argument('--max-vertices', type=int, default=10**5,
+                        help='largest number of vertices per polygon')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', action='append',
+                        help='only run named benchmark (may be repeated)')
+    parser.add_argument('--output', help='write JSON to file instead of stdout')
+    parser.add_argument('--baseline', help='JSON from earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=1.25)
+    opts = parser.parse_args(args)
+
+    report = run(opts.seed, opts.max_points, opts.max_vertices,
+                 opts.repeat, opts.only, sys.stderr)
+    text = json.dumps(report, indent=2)
+    if opts.output:
+        with open(opts.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if opts.baseline:
+        with open(opts.baseline) as f:
+            slower = compare(report, json.load(f), opts.tolerance)
+        for r, ratio in slower:
+            sys.stderr.write('slower: {} {} {} x{:.2f}\n'.format(
+                r['benchmark'], r['config'], r['size'], ratio))
+        if slower:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
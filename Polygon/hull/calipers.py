@@ -0,0 +1,197 @@
+from poly.polygon import Polygon
+from math import sqrt
+
+"""
+Rotating calipers over a convex polygon, such as one returned by
+computeHull: counter-clockwise, without collinear points.
+
+For each edge of the polygon in turn, three calipers track the vertex
+furthest along the edge direction, the vertex furthest from the edge
+and the vertex furthest back along the edge direction. As the edges
+turn counter-clockwise, so do these vertices, so each caliper only
+moves forward and all edges are handled in O(h) time for a polygon
+with h points. This gives the antipodal pairs, and with those the
+diameter, as well as the width and the minimum-area and
+minimum-perimeter bounding rectangles, each of which has one side
+flush with an edge of the polygon [Toussaint, "Solving geometric
+problems with the rotating calipers", 1983].
+"""
+
+def _coordinates(p):
+    """Return lists of x and y coordinates of polygon p."""
+    return ([pt.x() for pt in p], [pt.y() for pt in p])
+
+def _calipers(p):
+    """
+    Generate (i, a, b, c) for each edge i of convex polygon p, from
+    point i to point i+1, where a is the point furthest along the edge,
+    b the point furthest from (to the left of) the edge, and c the
+    point furthest back along the edge.
+    """
+    xs, ys = _coordinates(p)
+    n = len(xs)
+
+    def along(i, j):
+        """Projection of point j onto direction of edge i (unnormalized)."""
+        k = (i+1) % n
+        return (xs[k] - xs[i])*xs[j] + (ys[k] - ys[i])*ys[j]
+
+    def height(i, j):
+        """Distance of point j to the left of edge i (unnormalized)."""
+        k = (i+1) % n
+        return (xs[k] - xs[i])*(ys[j] - ys[i]) - (ys[k] - ys[i])*(xs[j] - xs[i])
+
+    a = b = c = None
+    for i in range(n):
+        if a is None:
+            a = 1
+        while along(i, (a+1) % n) > along(i, a):
+            a = (a+1) % n
+        if b is None:
+            b = a
+        while height(i, (b+1) % n) > height(i, b):
+            b = (b+1) % n
+        if c is None:
+            c = b
+        while along(i, (c+1) % n) < along(i, c):
+            c = (c+1) % n
+        yield (i, a, b, c)
+
+def _antipodal(p):
+    """
+    Generate antipodal pairs (i,j) of points in convex polygon p, with
+    i < j, in O(h) time. A pair may be generated more than once.
+    """
+    n = p.numPoints()
+    if n < 2:
+        return
+    if n == 2:
+        yield (0, 1)
+        return
+
+    xs, ys = _coordinates(p)
+    for (i, a, b, c) in _calipers(p):
+        k = (i+1) % n
+        yield (min(i, b), max(i, b))
+        yield (min(k, b), max(k, b))
+
+        # an edge parallel to edge i has both its points antipodal
+        nb = (b+1) % n
+        dx = xs[k] - xs[i]
+        dy = ys[k] - ys[i]
+        if dx*(ys[nb] - ys[b]) - dy*(xs[nb] - xs[b]) == 0:
+            yield (min(i, nb), max(i, nb))
+            yield (min(k, nb), max(k, nb))
+
+def antipodalPairs(p):
+    """
+    Return sorted list of all antipodal pairs (i,j) of points in convex
+    polygon p, with i < j, which are the points that admit parallel
+    lines of support.
+    """
+    return sorted(set(_antipodal(p)))
+
+def diameter(p):
+    """
+    Return (d, i, j) where d is the largest distance between two points
+    of convex polygon p, attained by points i and j. Return None if p
+    is empty. The furthest pair is kept while the calipers turn, so
+    this takes O(h) time. Of pairs equally far apart, the first in
+    sorted order is returned.
+    """
+    n = p.numPoints()
+    if n == 0:
+        return None
+    if n == 1:
+        return (0, 0, 0)
+
+    xs, ys = _coordinates(p)
+    best = None
+    for (i, j) in _antipodal(p):
+        d = (xs[i] - xs[j])**2 + (ys[i] - ys[j])**2
+        if best is None or d > best[0] or (d == best[0] and (i, j) < best[1:]):
+            best = (d, i, j)
+    return (sqrt(best[0]), best[1], best[2])
+
+def width(p):
+    """
+    Return (w, i, j) where w is the smallest distance between two
+    parallel lines enclosing convex polygon p, one through edge i (from
+    point i to point i+1) and the other through point j. Return None if
+    p has fewer than three points.
+    """
+    if not p.valid():
+        return None
+
+    n = p.numPoints()
+    xs, ys = _coordinates(p)
+    best = None
+    for (i, a, b, c) in _calipers(p):
+        k = (i+1) % n
+        dx = xs[k] - xs[i]
+        dy = ys[k] - ys[i]
+        w = (dx*(ys[b] - ys[i]) - dy*(xs[b] - xs[i])) / sqrt(dx*dx + dy*dy)
+        if best is None or w < best[0]:
+            best = (w, i, b)
+    return best
+
+def _rectangles(p):
+    """
+    Generate (area, perimeter, i, a, b, c) for the bounding rectangle
+    with one side flush with edge i of p, as found by _calipers.
+    """
+    n = p.numPoints()
+    xs, ys = _coordinates(p)
+    for (i, a, b, c) in _calipers(p):
+        k = (i+1) % n
+        dx = xs[k] - xs[i]
+        dy = ys[k] - ys[i]
+        length = sqrt(dx*dx + dy*dy)
+        span = (dx*(xs[a] - xs[c]) + dy*(ys[a] - ys[c])) / length
+        high = (dx*(ys[b] - ys[i]) - dy*(xs[b] - xs[i])) / length
+        yield (span * high, 2 * (span + high), i, a, b, c)
+
+def _rectangle(p, i, a, b, c):
+    """Return rectangle with side on edge i of p, touching points a, b and c."""
+    n = p.numPoints()
+    xs, ys = _coordinates(p)
+    k = (i+1) % n
+    dx = xs[k] - xs[i]
+    dy = ys[k] - ys[i]
+    length = sqrt(dx*dx + dy*dy)
+    ux = dx / length
+    uy = dy / length
+
+    # offsets along the edge and to its left, from point i
+    start = ux*(xs[c] - xs[i]) + uy*(ys[c] - ys[i])
+    end = ux*(xs[a] - xs[i]) + uy*(ys[a] - ys[i])
+    high = ux*(ys[b] - ys[i]) - uy*(xs[b] - xs[i])
+
+    rect = Polygon()
+    for (s, h) in [(start, 0), (end, 0), (end, high), (start, high)]:
+        rect.add(xs[i] + s*ux - h*uy, ys[i] + s*uy + h*ux)
+    return rect
+
+def minAreaRectangle(p):
+    """
+    Return (area, rectangle, (i, a, b, c)) for the bounding rectangle of
+    convex polygon p with smallest area, as a counter-clockwise polygon.
+    One side lies on edge i of p, and the other three touch points a, b
+    and c of p, in counter-clockwise order. Return None if p has fewer
+    than three points.
+    """
+    if not p.valid():
+        return None
+    best = min(_rectangles(p), key=lambda r: r[0])
+    return (best[0], _rectangle(p, *best[2:]), best[2:])
+
+def minPerimeterRectangle(p):
+    """
+    Return (perimeter, rectangle, (i, a, b, c)) for the bounding
+    rectangle of convex polygon p with smallest perimeter, as done by
+    minAreaRectangle. Return None if p has fewer than three points.
+    """
+    if not p.valid():
+        return None
+    best = min(_rectangles(p), key=lambda r: r[1])
+    return (best[1], _rectangle(p, *best[2:]), best[2:])
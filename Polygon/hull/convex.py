@@ -1,6 +1,10 @@
 from poly.polygon import Polygon
 from poly.point import Point
-from poly.util import value,computeAngleSign
+from poly.util import value,computeAngleSign,epsilon,numpy
+from poly.util import orient2d,ccwErrorBound
+import poly.util
+from array import array
+from multiprocessing import Pool, cpu_count
 import random
 
 """ 
@@ -43,7 +47,11 @@ def computeHull (points):
     """
     Compute the convex hull for given points and return as polygon.
     Returned polygon is in 'counter-clockwise' fashion, with the 
-    interior "to the left" of each edge.
+    interior "to the left" of each edge. When all coordinates are ints,
+    orientation is computed exactly in integer arithmetic. Otherwise
+    the hull is first found with exact orientation tests, and only then
+    are its points where it turns by no more than epsilon removed, so
+    the result depends on the hull alone and not on points inside it.
     """
     # sort by x coordinate (and if ==, by y coordinate). 
     n = len(points)
@@ -51,30 +59,19 @@ def computeHull (points):
     points = sorted(points, key=lambda pt:[pt.x(), pt.y()])
     if n < 3:
         return Polygon(points)
-        
-    # Compute upper hull by starting with rightmost two points
-    upper = Polygon ([points[-1], points[-2]])
-    for i in range(n-3, -1, -1):
-        upper.add (points[i].x(), points[i].y())
-
-        while upper.numPoints() >=3 and lastThreeNonLeft(upper):
-            upper.remove(-2)
-
-    # Compute lower hull by starting with leftmost two points
-    lower = Polygon ([points[0], points[1]])
-    for i in range(2, n):
-        lower.add (points[i].x(), points[i].y())
 
-        while lower.numPoints() >=3 and lastThreeNonLeft(lower):
-            lower.remove(-2)
-                
-    # Merge into upper (skip first and last to avoid duplication) and return.
-    upper.remove(-1)
-    upper.remove(0)
-    for pt in upper:
-        lower.add(pt.x(), pt.y())
+    if all(type(pt.x()) is int and type(pt.y()) is int for pt in points):
+        # exact, so no need for epsilon or Point objects along the way
+        hull = Polygon()
+        for (x, y) in _chain([(pt.x(), pt.y()) for pt in points], _signInt):
+            hull.add(x, y)
+        return hull
 
-    return lower
+    # exact hull, then nearly collinear points removed
+    hull = Polygon()
+    for (x, y) in _chain(sorted(_chain([(pt.x(), pt.y()) for pt in points], _orient))):
+        hull.add(x, y)
+    return hull
 
 def computeRandom(x, y, u, v):
     """
@@ -84,3 +81,310 @@ def computeRandom(x, y, u, v):
     """
     points = [Point(random.randint(x,u),random.randint(y,v)) for i in range(10)]
     return computeHull(points)
+
+def _sign(a, b, c):
+    """
+    Orientation of (x,y) tuples a, b, c, as computed by computeAngleSign
+    but without the function calls, since it is the inner loop here.
+    """
+    if poly.util.robust:
+        return orient2d(a[0], a[1], b[0], b[1], c[0], c[1])
+    diff = (b[0] - a[0])*(c[1] - a[1]) - (b[1] - a[1])*(c[0] - a[0])
+    if diff > epsilon:
+        return +1
+    if diff < -epsilon:
+        return -1
+    return 0
+
+def _orient(a, b, c):
+    """Orientation of (x,y) tuples a, b, c, computed exactly by orient2d."""
+    return orient2d(a[0], a[1], b[0], b[1], c[0], c[1])
+
+def _signInt(a, b, c):
+    """Orientation of (x,y) tuples a, b, c with int coordinates, computed exactly."""
+    diff = (b[0] - a[0])*(c[1] - a[1]) - (b[1] - a[1])*(c[0] - a[0])
+    return (diff > 0) - (diff < 0)
+
+def _chain(pts, sign=_sign):
+    """
+    Andrew's Algorithm over (x,y) tuples, already sorted by x coordinate
+    (and if ==, by y coordinate). Returns list of (x,y) tuples for the
+    same hull that computeHull would produce from its exact hull.
+    Orientation is computed by sign, which _signInt can replace when
+    coordinates are ints, or _orient to find the exact hull.
+    """
+    n = len(pts)
+    if n < 3:
+        return list(pts)
+
+    upper = [pts[-1], pts[-2]]
+    for i in range(n-3, -1, -1):
+        upper.append(pts[i])
+        while len(upper) >= 3 and sign(upper[-3], upper[-2], upper[-1]) <= 0:
+            del upper[-2]
+
+    lower = [pts[0], pts[1]]
+    for i in range(2, n):
+        lower.append(pts[i])
+        while len(lower) >= 3 and sign(lower[-3], lower[-2], lower[-1]) <= 0:
+            del lower[-2]
+
+    return lower + upper[1:-1]
+
+def _prefilter(pts):
+    """
+    Akl-Toussaint heuristic. Return those (x,y) tuples that are not
+    strictly inside the polygon formed by extreme points, even allowing
+    for rounding, since they can't be on the exact hull. Besides the
+    leftmost, lowest, rightmost and highest points of the original
+    quadrilateral, the extremes along both diagonals are used, which
+    discards far more points from inputs that fill a square.
+    """
+    corners = {min(pts), max(pts),
+               min(pts, key=lambda p:(p[1], p[0])),
+               max(pts, key=lambda p:(p[1], p[0])),
+               min(pts, key=lambda p:(p[0] + p[1], p[0])),
+               max(pts, key=lambda p:(p[0] + p[1], p[0])),
+               min(pts, key=lambda p:(p[0] - p[1], p[0])),
+               max(pts, key=lambda p:(p[0] - p[1], p[0]))}
+    extreme = _chain(sorted(corners))
+    if len(extreme) < 3:
+        return pts
+
+    edges = []
+    for i in range(len(extreme)):
+        (x1, y1) = extreme[i]
+        (x2, y2) = extreme[(i+1) % len(extreme)]
+        edges.append((x1, y1, x2 - x1, y2 - y1))
+
+    # inside only when rounding can't account for being to the left
+    kept = []
+    for p in pts:
+        x, y = p
+        for (x1, y1, dx, dy) in edges:
+            left = dx*(y - y1)
+            right = dy*(x - x1)
+            if left - right <= ccwErrorBound * (abs(left) + abs(right)):
+                kept.append(p)
+                break
+    return kept
+
+def _better(p, best, q):
+    """Determine if q is more clockwise than best, as seen from p."""
+    sign = _orient(p, best, q)
+    if sign != 0:
+        return sign < 0
+    return (q[0]-p[0])**2 + (q[1]-p[1])**2 > (best[0]-p[0])**2 + (best[1]-p[1])**2
+
+def _tangent(h, p):
+    """
+    Return index of vertex t in hull h (counter-clockwise, no collinear
+    points) such that all of h is to the left of the ray from p, a point
+    outside of h, through h[t]. Binary search as described by Dan Sunday,
+    "Tangents to and between polygons", with a linear scan as fallback.
+    """
+    n = len(h)
+    if n > 8:
+        def tangent(c):
+            return (_orient(p, h[c], h[(c+1) % n]) > 0 and
+                    _orient(p, h[c], h[c-1]) >= 0)
+
+        if tangent(0):
+            return 0
+        a, b = 0, n
+        steps = 2 * n.bit_length() + 4
+        while steps > 0 and b - a > 1:
+            steps -= 1
+            c = (a + b) // 2
+            if tangent(c):
+                return c
+            downC = _orient(p, h[c], h[(c+1) % n]) > 0
+            upA = _orient(p, h[a], h[(a+1) % n]) < 0
+            if upA:
+                if downC or _orient(p, h[a], h[c]) > 0:
+                    b = c
+                else:
+                    a = c
+            else:
+                if downC and _orient(p, h[a], h[c]) < 0:
+                    b = c
+                else:
+                    a = c
+
+    best = 0
+    for i in range(1, n):
+        if _better(p, h[best], h[i]):
+            best = i
+    return best
+
+def _chan(pts):
+    """
+    Chan's Algorithm over (x,y) tuples. Hulls of groups of m points are
+    wrapped with Jarvis's march, using binary search to find the tangent
+    to each group, for at most m steps; m is squared until that suffices.
+    After a round fails, only points on the hulls of their groups remain.
+    When those are most of the points, the hull is large, and wrapping
+    it would cost more than the monotone chain, so that is used instead.
+    Orientation is computed exactly, so the exact hull is returned.
+    """
+    start = min(pts)
+    t = 2
+    while True:
+        n = len(pts)
+        m = 2 ** (2 ** t)
+        if m * m >= n:
+            # hull is large enough that wrapping gains nothing
+            return _chain(sorted(pts), _orient)
+        hulls = [_chain(sorted(pts[i:i+m]), _orient) for i in range(0, n, m)]
+        pts = [q for h in hulls for q in h]
+        if 4 * len(pts) > 3 * n:
+            return _chain(sorted(pts), _orient)
+        index = [{q:k for k, q in enumerate(h)} for h in hulls]
+
+        hull = [start]
+        p = start
+        for step in range(m):
+            best = None
+            for g in range(len(hulls)):
+                h = hulls[g]
+                k = index[g].get(p)
+                if k is not None:
+                    q = h[(k+1) % len(h)]
+                else:
+                    q = h[_tangent(h, p)]
+                if q != p and (best is None or _better(p, best, q)):
+                    best = q
+
+            if best == start:
+                return hull
+            hull.append(best)
+            p = best
+        t += 1
+
+def computeHullChan (points):
+    """
+    Compute the convex hull for given points and return as polygon,
+    the same as computeHull, in time that depends on the size of the
+    hull. Points that can't be on the hull are first removed in a single
+    pass, then Chan's Algorithm takes O(n log h) time for h hull points.
+    Once the hull is known to be large, such as when most points lie
+    on it, the remaining points are handled as computeHull would. Like
+    computeHull, the exact hull is found first, then nearly collinear
+    points are removed from it.
+    """
+    pts = [(pt.x(), pt.y()) for pt in points]
+    if len(pts) < 3 or min(pts) == max(pts):
+        pts.sort()
+        return Polygon([Point(x, y) for (x, y) in pts])
+
+    hull = Polygon()
+    for (x, y) in _chain(sorted(_chan(_prefilter(pts)))):
+        hull.add(x, y)
+    return hull
+
+def _prefilterArray(xs, ys):
+    """
+    Akl-Toussaint heuristic over NumPy arrays of x and y coordinates,
+    as in _prefilter, but only removing points that are inside even
+    allowing for rounding, so the exact hull is kept. Return boolean
+    mask of the points to keep.
+    """
+    keep = numpy.ones(len(xs), dtype=bool)
+    corners = set()
+    for values in (xs, ys, xs + ys, xs - ys):
+        for i in (int(values.argmin()), int(values.argmax())):
+            corners.add((float(xs[i]), float(ys[i])))
+    extreme = _chain(sorted(corners))
+    if len(extreme) < 3:
+        return keep
+
+    inside = numpy.ones(len(xs), dtype=bool)
+    for i in range(len(extreme)):
+        (x1, y1) = extreme[i]
+        (x2, y2) = extreme[(i+1) % len(extreme)]
+        left = (x2 - x1)*(ys - y1)
+        right = (y2 - y1)*(xs - x1)
+        inside &= left - right > ccwErrorBound * (numpy.abs(left) + numpy.abs(right))
+    return ~inside
+
+def computeHullArray (coords):
+    """
+    Compute the convex hull for an (N,2) array of coordinates, without
+    creating a Point for every input. Return (indices, polygon) where
+    polygon is the same as computeHull would produce, and indices gives
+    the row in coords of each of its points. With NumPy, sorting and the
+    removal of points that can't be on the hull are vectorized, and
+    indices is an array; otherwise coords may be any sequence of (x,y)
+    pairs and indices is a list.
+    """
+    if numpy is not None:
+        coords = numpy.asarray(coords, dtype=float).reshape(-1, 2)
+        xs = coords[:, 0]
+        ys = coords[:, 1]
+        order = numpy.lexsort((ys, xs))
+        if len(order) >= 3:
+            order = order[_prefilterArray(xs, ys)[order]]
+        pts = list(zip(xs[order].tolist(), ys[order].tolist(), order.tolist()))
+    else:
+        pts = sorted((float(x), float(y), i) for i, (x, y) in enumerate(coords))
+
+    # _chain only looks at x and y, so the index travels along
+    if len(coords) >= 3:
+        pts = _chain(sorted(_chain(pts, _orient)))
+
+    indices = [i for (x, y, i) in pts]
+    if numpy is not None:
+        indices = numpy.array(indices, dtype=numpy.intp)
+    return (indices, Polygon([Point(x, y) for (x, y, i) in pts]))
+
+def _packTuples(pts):
+    """Return bytes of array('d') holding coordinates of (x,y) tuples."""
+    coords = array('d')
+    for (x, y) in pts:
+        coords.append(x)
+        coords.append(y)
+    return coords.tobytes()
+
+def _hullPacked(data):
+    """Worker computing exact hull of packed coordinates, returned packed."""
+    coords = array('d')
+    coords.frombytes(data)
+    return _packTuples(_chain(sorted(zip(coords[0::2], coords[1::2])), _orient))
+
+def computeHullParallel (points, workers=None):
+    """
+    Compute the convex hull for given points using a pool of worker
+    processes; the default is one per CPU. Points are split into one
+    shard per worker, the hull of each shard is computed in parallel,
+    and the partial hulls are merged. Shards keep their exact hulls,
+    which together hold the exact hull of all the points, so the polygon
+    is the same as computeHull would produce, though its coordinates
+    are floats.
+    """
+    if workers is None:
+        workers = cpu_count()
+    pts = [(float(pt.x()), float(pt.y())) for pt in points]
+    n = len(pts)
+    if n < 3:
+        return computeHull(points)
+
+    size = -(-n // workers)
+    shards = [_packTuples(pts[i:i+size]) for i in range(0, n, size)]
+    del pts
+    if len(shards) == 1:
+        partial = [_hullPacked(shards[0])]
+    else:
+        with Pool(workers) as pool:
+            partial = pool.map(_hullPacked, shards)
+
+    merged = []
+    for data in partial:
+        coords = array('d')
+        coords.frombytes(data)
+        merged.extend(zip(coords[0::2], coords[1::2]))
+    merged.sort()
+
+    hull = Polygon()
+    for (x, y) in _chain(sorted(_chain(merged, _orient))):
+        hull.add(x, y)
+    return hull
@@ -0,0 +1,103 @@
+from poly.polygon import Polygon
+from poly.point import Point
+from hull.convex import _chain, _orient
+from bisect import bisect_left
+
+"""
+Maintain convex hull of points that arrive one at a time.
+
+Andrew's Algorithm (see hull.convex) splits the hull into a lower
+and an upper chain, each sorted by x coordinate (and if ==, by y
+coordinate). Both chains are kept here, so a new point is located in
+each chain with a binary search. A point on or above the lower chain
+and on or below the upper chain is inside the hull and is rejected
+with just two orientation tests. Otherwise the point is inserted into
+a chain, and neighbors that no longer form a left turn are removed.
+Each point is removed at most once, so the cost of an insertion is
+amortized O(log h) comparisons, plus the time to shift the list.
+
+The chains hold the exact hull, as found by orient2d, since the epsilon
+test of computeHull depends on which points are present. Nearly
+collinear points are removed when the polygon is built, as computeHull
+does, so the resulting hull is the same as computeHull would produce
+for all the points added, that is, counter-clockwise starting from the
+point with smallest x coordinate.
+"""
+
+class IncrementalHull:
+    """Convex hull that can be extended one point at a time."""
+
+    def __init__(self, points=[]):
+        """Create hull for (possibly empty) list of points."""
+        self.lower = []        # (x,y) tuples, each consecutive triple turns left
+        self.upper = []        # (x,y) tuples, each consecutive triple turns right
+        self.count = 0
+        self._polygon = None
+        for pt in points:
+            self.add(pt)
+
+    def _insert(self, chain, p, turn):
+        """
+        Insert p into chain unless it is on the inside of the chain,
+        where turn is +1 for the lower chain and -1 for the upper one.
+        Return True if chain changed.
+        """
+        i = bisect_left(chain, p)
+        if i < len(chain) and chain[i] == p:
+            return False
+        if 0 < i < len(chain) and _orient(chain[i-1], chain[i], p) * turn >= 0:
+            return False
+
+        chain.insert(i, p)
+        while i+2 < len(chain) and _orient(chain[i], chain[i+1], chain[i+2]) * turn <= 0:
+            del chain[i+1]
+        while i >= 2 and _orient(chain[i-2], chain[i-1], chain[i]) * turn <= 0:
+            del chain[i-1]
+            i -= 1
+        return True
+
+    def _inside(self, chain, p, turn):
+        """Determine if p is on the inside of chain (or on it)."""
+        i = bisect_left(chain, p)
+        if i < len(chain) and chain[i] == p:
+            return True
+        if 0 < i < len(chain):
+            return _orient(chain[i-1], chain[i], p) * turn >= 0
+        return False
+
+    def add(self, pt):
+        """Add point to hull. Return True if hull changed."""
+        self.count += 1
+        p = (pt.x(), pt.y())
+        changedLower = self._insert(self.lower, p, +1)
+        changedUpper = self._insert(self.upper, p, -1)
+        if changedLower or changedUpper:
+            self._polygon = None
+            return True
+        return False
+
+    def contains(self, pt):
+        """Determine if pt is inside (or on the boundary of) the hull."""
+        p = (pt.x(), pt.y())
+        return self._inside(self.lower, p, +1) and self._inside(self.upper, p, -1)
+
+    def numPoints(self):
+        """Return the number of points in the hull."""
+        return self.hull().numPoints()
+
+    def __iter__(self):
+        """Return points in the hull in counter-clockwise order."""
+        for pt in self.hull():
+            yield Point(pt.x(), pt.y())
+
+    def hull(self):
+        """
+        Return current hull as polygon. The same polygon is returned
+        until the hull changes, so it should not be modified.
+        """
+        if self._polygon is None:
+            exact = self.lower + self.upper[-2:0:-1]
+            if len(exact) >= 3:
+                exact = _chain(sorted(exact))
+            self._polygon = Polygon([Point(x, y) for (x, y) in exact])
+        return self._polygon
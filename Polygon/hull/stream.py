@@ -0,0 +1,68 @@
+from poly.polygon import Polygon
+from poly.point import Point
+from hull.convex import _chain, _orient
+from itertools import islice
+
+"""
+Compute convex hull of points that do not fit in memory.
+
+computeHull needs all the points in a list, and sorting makes another
+copy. Here points are consumed from any iterable, or from a text file
+with one "x y" (or "x,y") pair per line, in chunks of fixed size. Each
+chunk is merged with the hull of all earlier chunks, since the hull of
+those points together is the hull of the whole. Only the current chunk
+and the running hull are kept, so memory is O(chunk + h) for h hull
+points, no matter how many points there are.
+
+The running hull is exact, as found by orient2d, and nearly collinear
+points are only removed at the end, as computeHull does, so the
+resulting hull is the same as computeHull would produce.
+"""
+
+def readCoordinates(f):
+    """
+    Generate (x,y) tuples from text file with one point per line,
+    separated by whitespace or comma. Blank lines and lines starting
+    with '#' are skipped.
+    """
+    for line in f:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        x, y = line.replace(',', ' ').split()
+        yield (float(x), float(y))
+
+def _coordinates(source):
+    """Generate (x,y) tuples from file or iterable of points."""
+    if hasattr(source, 'readline'):
+        return readCoordinates(source)
+    return ((pt.x(), pt.y()) for pt in source)
+
+def computeHullStream(source, chunk=1<<16):
+    """
+    Compute the convex hull for points from source, either an iterable
+    of points or an open text file, reading chunk points at a time.
+    Returned polygon is in 'counter-clockwise' fashion, the same as
+    computeHull.
+    """
+    if chunk < 3:
+        raise ValueError("chunk must hold at least three points")
+
+    coords = _coordinates(source)
+    hull = []
+    count = 0
+    while True:
+        block = list(islice(coords, chunk))
+        if not block:
+            break
+        count += len(block)
+        block.extend(hull)
+        block.sort()
+        if count < 3:
+            hull = block
+        else:
+            hull = _chain(block, _orient)
+
+    if count >= 3:
+        hull = _chain(sorted(hull))
+    return Polygon([Point(x, y) for (x, y) in hull])
@@ -0,0 +1,128 @@
+"""
+    Compact binary file format for collections of polygons.
+
+    A file starts with a 16 byte header: the magic bytes b'POLY', the
+    format version and the number of polygons n, as little-endian
+    unsigned 32 and 64 bit integers. Then follow n+1 offsets, unsigned
+    64 bit integers where polygon i has the points from offsets[i] up
+    to offsets[i+1]. Last come the coordinates of all points, as
+    alternating x and y values in 64 bit floats.
+
+    PolygonFile memory-maps such a file, so opening it reads only the
+    header, and each polygon is a PackedPolygon whose coordinates are a
+    view into the mapped file. Nothing is copied, and only the pages
+    holding the requested polygons are read from disk. These polygons
+    are read-only; use copy() to get one that can be changed.
+
+    On big-endian machines, coordinates are converted while reading,
+    which means they are copied.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from poly.packed import PackedPolygon
+
+MAGIC = b'POLY'
+VERSION = 1
+HEADER = struct.Struct('<4sIQ')
+
+def writePolygons(path, polygons):
+    """Write sequence of polygons to file at path."""
+    polygons = list(polygons)
+    offsets = array('Q', [0])
+    for p in polygons:
+        offsets.append(offsets[-1] + p.numPoints())
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(polygons)))
+        f.write(offsets.tobytes())
+        for p in polygons:
+            if isinstance(p, PackedPolygon):
+                coords = array('d', p.coords())
+            else:
+                coords = array('d')
+                for pt in p:
+                    coords.append(pt.x())
+                    coords.append(pt.y())
+            if sys.byteorder != 'little':
+                coords.byteswap()
+            f.write(coords.tobytes())
+
+class PolygonFile:
+    """Read-only collection of polygons in a memory-mapped file."""
+
+    def __init__(self, path):
+        """Open file at path, written by writePolygons."""
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise ValueError("not a polygon file: {}".format(path))
+        magic, version, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError("not a polygon file: {}".format(path))
+
+        start = HEADER.size + 8*(count + 1)
+        if len(self._map) < start or (len(self._map) - start) % 8 != 0:
+            self._map.close()
+            raise ValueError("truncated polygon file: {}".format(path))
+        self._data = data = memoryview(self._map)
+        if sys.byteorder == 'little':
+            self._offsets = data[HEADER.size:start].cast('Q')
+            self._coords = data[start:].cast('d')
+        else:
+            self._offsets = array('Q', data[HEADER.size:start])
+            self._offsets.byteswap()
+            self._coords = array('d', data[start:])
+            self._coords.byteswap()
+        self._count = count
+        if 2 * self._offsets[count] > len(self._coords):
+            self.close()
+            raise ValueError("truncated polygon file: {}".format(path))
+
+    def __len__(self):
+        """Return the number of polygons."""
+        return self._count
+
+    def __getitem__(self, n):
+        """Return view of nth polygon (based on zero) as PackedPolygon."""
+        if n < 0:
+            n += self._count
+        if n < 0 or n >= self._count:
+            raise IndexError("polygon index out of range")
+        start = 2 * self._offsets[n]
+        end = 2 * self._offsets[n+1]
+        return PackedPolygon(coords=self._coords[start:end])
+
+    def __iter__(self):
+        """Return views of polygons in order."""
+        for n in range(self._count):
+            yield self[n]
+
+    def close(self):
+        """
+        Unmap the file. If polygons from this file are still in use,
+        the file stays mapped until they are gone.
+        """
+        if isinstance(self._coords, memoryview):
+            self._offsets.release()
+            self._coords.release()
+        self._data.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        """Use file as context manager, which closes it when done."""
+        return self
+
+    def __exit__(self, *args):
+        """Close file at end of with statement."""
+        self.close()
@@ -0,0 +1,252 @@
+"""
+    Boolean operations on simple polygons, which need not be convex.
+
+    intersection, union, difference and xor each take two polygons and
+    return a list of polygons. Either argument may also be a list of
+    polygons, such as one returned by these functions, so operations can
+    be chained. A point is inside a list of polygons when it is inside
+    an odd number of them, so the orientation of the input polygons
+    doesn't matter. A Polygon has no holes, so the result is a list of
+    rings: outer boundaries are counter-clockwise and holes clockwise,
+    that is, the result is on the left of every edge. Rings may touch
+    at a point, but never cross.
+
+    This follows the plane sweep of Martinez, Rueda and Feito ["A new
+    algorithm for computing Boolean operations on polygons", 2009] in
+    three steps, for polygons with n and m points whose edges cross or
+    touch in k places:
+
+    1. The sweep of poly.sweep finds where edges cross or touch, and
+       edges are split there, in O((n+m+k) log(n+m)) time. Two pieces
+       then either meet only at their end-points, or coincide.
+    2. A second sweep, over pieces that no longer cross, finds for each
+       piece whether the region just above it is inside either polygon,
+       from the piece just below it along the sweep line. A piece is
+       part of the result when the operation gives different answers
+       on its two sides; a piece that both polygons share counts once.
+    3. The pieces of the result are joined into rings, turning as far
+       left as possible where several meet.
+"""
+
+from functools import cmp_to_key
+from math import atan2
+from poly.polygon import Polygon
+from poly.sweep import findSplitPoints
+from poly.util import computeAngleSign
+
+OPERATIONS = {
+    'intersection': lambda a, b: a and b,
+    'union':        lambda a, b: a or b,
+    'difference':   lambda a, b: a and not b,
+    'xor':          lambda a, b: a != b,
+}
+
+def _polygons(p):
+    """Return list of polygons in p, which is a polygon or list of them."""
+    if isinstance(p, Polygon):
+        return [p]
+    return list(p)
+
+def _pieces(p, q):
+    """
+    Return list of pieces (left, right, group) of the edges of p (group
+    0) and q (group 1), split wherever they cross or touch, where left
+    comes before right in (x,y) order.
+    """
+    segments = []
+    groups = []
+    for group, polygons in enumerate((_polygons(p), _polygons(q))):
+        for polygon in polygons:
+            if polygon.valid():
+                for s in polygon.segments():
+                    if s[:2] != s[2:]:
+                        segments.append(s)
+                        groups.append(group)
+
+    pieces = []
+    for s, group, points in zip(segments, groups, findSplitPoints(segments)):
+        a = (s[0], s[1])
+        b = (s[2], s[3])
+        if b < a:
+            a, b = b, a
+
+        # points on segment come in (x,y) order along it
+        points = [a] + [pt for pt in points if a < pt < b] + [b]
+        for i in range(len(points)-1):
+            pieces.append((points[i], points[i+1], group))
+    return pieces
+
+def _boundary(pieces, operation):
+    """
+    Sweep across pieces, which do not cross, from left to right and
+    return list of directed edges (a, b) of the result of operation,
+    which has the result on its left.
+    """
+    starts = {}     # event point -> pieces starting there
+    ends = {}       # event point -> pieces ending there
+    for k, (a, b, group) in enumerate(pieces):
+        starts.setdefault(a, []).append(k)
+        starts.setdefault(b, [])
+        ends.setdefault(b, []).append(k)
+
+    above = [None] * len(pieces)    # (inside p, inside q) just above piece
+    twin = [False] * len(pieces)    # piece coincides with the one below
+    shadowed = [False] * len(pieces) # piece coincides with the one above
+    status = []
+
+    def side(k, px, py):
+        """Return -1 if piece k passes below (px,py), 0 if through, +1 if above."""
+        a, b, group = pieces[k]
+        return -computeAngleSign(a[0], a[1], b[0], b[1], px, py)
+
+    def below(j, k):
+        """Order pieces j and k, both through the event point, bottom to top."""
+        a, b, group = pieces[j]
+        c = pieces[k][1]
+        s = computeAngleSign(a[0], a[1], b[0], b[1], c[0], c[1])
+        if s != 0:
+            return -s
+        return group - pieces[k][2]
+
+    for p in sorted(starts):
+        px, py = p
+
+        # binary search for block of pieces passing through p, which
+        # end there since pieces do not cross
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if side(status[mid], px, py) < 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        hi = lo
+        while hi < len(status) and side(status[hi], px, py) == 0:
+            hi += 1
+        through = status[lo:hi]
+
+        # rounding may have left an ending piece out of order; evict it
+        for k in ends.get(p, ()):
+            if k not in through and k in status:
+                i = status.index(k)
+                del status[i]
+                if i < lo:
+                    lo -= 1
+
+        block = [k for k in through if pieces[k][1] != p] + starts[p]
+        block.sort(key=cmp_to_key(below))
+        status[lo:lo+len(through)] = block
+
+        # crossing a piece moves in or out of its own polygon only
+        inside = above[status[lo-1]] if lo > 0 else (False, False)
+        for i in range(lo, lo + len(block)):
+            k = status[i]
+            group = pieces[k][2]
+            inside = (not inside[0], inside[1]) if group == 0 else (inside[0], not inside[1])
+            above[k] = inside
+            if i > lo and pieces[status[i-1]][:2] == pieces[k][:2]:
+                twin[k] = True
+                shadowed[status[i-1]] = True
+
+    edges = []
+    for k, (a, b, group) in enumerate(pieces):
+        if shadowed[k]:
+            continue
+        inside = above[k]
+        if twin[k]:
+            outside = (not inside[0], not inside[1])
+        elif group == 0:
+            outside = (not inside[0], inside[1])
+        else:
+            outside = (inside[0], not inside[1])
+
+        # result is above, on the left of a to b, or below
+        over = operation(*inside)
+        if over != operation(*outside):
+            edges.append((a, b) if over else (b, a))
+    return edges
+
+def _ring(points, incident):
+    """
+    Return Polygon of points, leaving out those where it runs straight
+    on, unless other edges in incident meet there too. Like computeHull,
+    start from the leftmost point.
+    """
+    n = len(points)
+    first = points.index(min(points))
+    ring = Polygon()
+    for i in range(first, first + n):
+        a = points[(i-1) % n]
+        b = points[i % n]
+        c = points[(i+1) % n]
+        if len(incident[b]) > 2 or computeAngleSign(a[0], a[1], b[0], b[1], c[0], c[1]) != 0:
+            ring.add(b[0], b[1])
+    return ring
+
+def _join(edges):
+    """
+    Join directed edges (a, b) into rings. Where several edges meet at a
+    point, each edge arriving there continues with the edge that turns
+    furthest left, so rings touch rather than cross each other.
+    """
+    incident = {}
+    for k, (a, b) in enumerate(edges):
+        incident.setdefault(a, []).append((atan2(b[1] - a[1], b[0] - a[0]), False, k))
+        incident.setdefault(b, []).append((atan2(a[1] - b[1], a[0] - b[0]), True, k))
+
+    # in counter-clockwise order of direction away from the point, the
+    # furthest left turn is the first leaving edge clockwise from arrival
+    successor = [None] * len(edges)
+    for v, around in incident.items():
+        around.sort()
+        n = len(around)
+        taken = set()
+        for i in range(n):
+            if around[i][1]:
+                for step in range(1, n):
+                    (angle, arriving, k) = around[(i - step) % n]
+                    if not arriving and k not in taken:
+                        taken.add(k)
+                        successor[around[i][2]] = k
+                        break
+
+    rings = []
+    done = [False] * len(edges)
+    for k in range(len(edges)):
+        points = []
+        while k is not None and not done[k]:
+            done[k] = True
+            points.append(edges[k][0])
+            k = successor[k]
+        if points:
+            ring = _ring(points, incident)
+            if ring.valid():
+                rings.append(ring)
+    return rings
+
+def clip(p, q, operation):
+    """
+    Return list of rings for the result of operation on p and q, each a
+    polygon or list of polygons. The operation is one of 'intersection',
+    'union', 'difference' (p without q) and 'xor'.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError("unknown operation: {}".format(operation))
+    pieces = _pieces(p, q)
+    return _join(_boundary(pieces, OPERATIONS[operation]))
+
+def intersection(p, q):
+    """Return list of rings covering the area inside both p and q."""
+    return clip(p, q, 'intersection')
+
+def union(p, q):
+    """Return list of rings covering the area inside p or q."""
+    return clip(p, q, 'union')
+
+def difference(p, q):
+    """Return list of rings covering the area inside p but not q."""
+    return clip(p, q, 'difference')
+
+def xor(p, q):
+    """Return list of rings covering the area inside exactly one of p and q."""
+    return clip(p, q, 'xor')
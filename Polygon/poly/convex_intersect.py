@@ -1,7 +1,12 @@
 from poly.polygon import Polygon
+from poly.packed import PackedPolygon
 from poly.point import Point
-from poly.util import value,computeAngleSign
-from math import degrees, acos, sqrt
+from poly.util import value,computeAngleSign,epsilon,numpy
+import poly.util
+from math import sqrt
+from array import array
+from multiprocessing import Pool, cpu_count
+from itertools import islice
 
 """ 
 Implement Convex Polygon Intersection algorithm 
@@ -10,6 +15,19 @@ https://pdfs.semanticscholar.org/3a68/0593c409eb0d86a9c436113581df970554ba.pdf
 
 Note that this algorithm only works on convex polygons.
 
+For large batches of independent pairs, convexIntersectMany spreads
+the work across a pool of processes. Polygons travel between processes
+as the raw bytes of an array('d') of coordinates, which pickles far
+more compactly than Polygon objects holding Point objects.
+
+When only a yes or no answer is needed, separatingEdge and
+convexOverlapLog determine whether two convex polygons overlap
+without computing their intersection.
+
+minkowskiSum and minkowskiDifference merge the edges of two convex
+polygons by angle in O(n+m) time, and penetration uses the difference
+to find how far one polygon must move to just touch the other.
+
 In general assumes that whenever two edges intersect, they intersect
 in a single point that is not a vertex of exither polygon. Might not
 handle some really special cases, as described in the above paper.
@@ -49,21 +67,88 @@ def dist(p, q):
 
 def containedWithin(pt, p):
     """
-    Determine if pt is fully contained within p. Do so by 
-    summing angles with each edge in the convex polygon p.
+    Determine if pt is contained within (or on the boundary of) the
+    convex polygon p, in standard form. The diagonals from the first
+    vertex of p divide it into triangular wedges, so a binary search
+    locates the wedge that could contain pt in O(log n) time.
     """
-    sum = 0
-    for e in p.edges():
-        C = dist(e.head(), e.tail())
-        A = dist(pt, e.head())
-        B = dist(pt, e.tail())
-        sum += degrees(acos((A*A+B*B-C*C)/(2*A*B)))
-    return value(sum-360) == 0
+    n = p.numPoints()
+    if n < 3:
+        return False
+    x = pt.x()
+    y = pt.y()
+    x0 = p.get(0).x()
+    y0 = p.get(0).y()
+    if computeAngleSign(x0, y0, p.get(1).x(), p.get(1).y(), x, y) < 0:
+        return False
+    if computeAngleSign(x0, y0, p.get(-1).x(), p.get(-1).y(), x, y) > 0:
+        return False
 
-def convexIntersect(p, q):
+    # find last diagonal (0,k) that has pt on its left
+    lo, hi = 1, n-2
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if computeAngleSign(x0, y0, p.get(mid).x(), p.get(mid).y(), x, y) >= 0:
+            lo = mid
+        else:
+            hi = mid - 1
+
+    a = p.get(lo)
+    b = p.get(lo+1)
+    return computeAngleSign(a.x(), a.y(), b.x(), b.y(), x, y) >= 0
+
+def containedWithinMany(points, p):
     """
-    Compute and return polygon resulting from the intersection of
-    two convext polygons, p and q.
+    Return list of booleans, determining for each point in points
+    whether it is contained within the convex polygon p, as done by
+    containedWithin. With NumPy, all binary searches proceed together.
+    """
+    n = p.numPoints()
+    if numpy is None or n < 3:
+        return [containedWithin(pt, p) for pt in points]
+
+    vx = numpy.array([pt.x() for pt in p], dtype=float)
+    vy = numpy.array([pt.y() for pt in p], dtype=float)
+    x = numpy.array([pt.x() for pt in points], dtype=float)
+    y = numpy.array([pt.y() for pt in points], dtype=float)
+
+    def sign(x1, y1, x2, y2):
+        """Vectorized computeAngleSign for (x1,y1), (x2,y2), (x,y)."""
+        diff = (x2 - x1)*(y - y1) - (y2 - y1)*(x - x1)
+        diff[numpy.abs(diff) <= epsilon] = 0
+        return numpy.sign(diff)
+
+    inside = sign(vx[0], vy[0], vx[1], vy[1]) >= 0
+    inside &= sign(vx[0], vy[0], vx[-1], vy[-1]) <= 0
+
+    lo = numpy.ones(len(x), dtype=int)
+    hi = numpy.full(len(x), n-2)
+    active = lo < hi
+    while numpy.any(active):
+        mid = (lo + hi + 1) // 2
+        left = sign(vx[0], vy[0], vx[mid], vy[mid]) >= 0
+        lo = numpy.where(active & left, mid, lo)
+        hi = numpy.where(active & ~left, mid - 1, hi)
+        active = lo < hi
+
+    inside &= sign(vx[lo], vy[lo], vx[lo+1], vy[lo+1]) >= 0
+    return inside.tolist()
+
+def _integral(p):
+    """Determine if all coordinates of polygon p are ints."""
+    for pt in p:
+        if type(pt.x()) is not int or type(pt.y()) is not int:
+            return False
+    return True
+
+def _walk(p, q, pi, qi, exact=False):
+    """
+    Advance around convex polygons p and q, starting from edge pi of p
+    and edge qi of q, collecting the vertices of their intersection.
+    Return (intersection, edges), where edges is (pi, qi) for the pair
+    of edges that intersected first, or None if no edges intersect.
+    If exact, p and q have int coordinates, and points where edges
+    intersect are computed exactly, only rounded to float at the end.
     """
     intersection = Polygon()
     pn = p.numEdges()
@@ -71,13 +156,18 @@ def convexIntersect(p, q):
     k = 1
     inside = None              # can't know inside until intersection
     first = None               # remember 1st intersection to know when to stop
-    firstp = pe = p.edges()[0] # get first edge of p and q
-    firstq = qe = q.edges()[0]
+    edges = None
+    pe = p._edgeRing()[pi]
+    qe = q._edgeRing()[qi]
     while k < 2*(pn + qn):
-        pt = pe.intersect(qe)
+        if exact:
+            pt = pe.intersectExact(qe)
+        else:
+            pt = pe.intersect(qe)
         if pt is not None:
             if first == None:
                 first = pt
+                edges = (pi, qi)
             elif pt == first:
                 # stop when find first intersection again
                 break
@@ -135,20 +225,506 @@ def convexIntersect(p, q):
             if inside is p:
                 intersection.add(pe.tail().x(), pe.tail().y())
             pe = pe.next()
+            pi = (pi + 1) % pn
         elif advanceq:
             if inside is q:
                 intersection.add(qe.tail().x(), qe.tail().y())
             qe = qe.next()
+            qi = (qi + 1) % qn
 
         k += 1
-            
+
+    if exact:
+        for pt in intersection:
+            pt.set(float(pt.x()), float(pt.y()))
+    return (intersection, edges)
+
+def _noCrossing(p, q):
+    """
+    Result of intersecting p and q when none of their edges intersect.
+    Polygons that only touch have a vertex on the boundary of the other,
+    so one vertex says little; p lies within convex q when every vertex
+    of p does, in O(n log m) time.
+    """
+    if all(containedWithin(pt, q) for pt in p):
+        return p
+    elif all(containedWithin(pt, p) for pt in q):
+        return q
+    else:
+        return None
+
+def convexIntersect(p, q):
+    """
+    Compute and return polygon resulting from the intersection of
+    two convext polygons, p and q. When all their coordinates are ints,
+    intersections of edges are computed exactly, so the result does
+    not depend on rounding along the way.
+    """
+    intersection, edges = _walk(p, q, 0, 0, _integral(p) and _integral(q))
     if intersection.numPoints() == 0:
-        if containedWithin(firstp.tail(), q):
-            return p
-        elif containedWithin(firstq.tail(), p):
-            return q
-        else:
-            return None
+        return _noCrossing(p, q)
 
     # Return computed intersection
     return intersection
+
+def pack(p):
+    """Return coordinates of polygon p as bytes of an array('d')."""
+    if p is None:
+        return None
+    if isinstance(p, PackedPolygon):
+        return p.coords().tobytes()
+    coords = array('d')
+    for pt in p:
+        coords.append(pt.x())
+        coords.append(pt.y())
+    return coords.tobytes()
+
+def unpack(data):
+    """Return PackedPolygon from bytes produced by pack."""
+    if data is None:
+        return None
+    coords = array('d')
+    coords.frombytes(data)
+    return PackedPolygon(coords=coords)
+
+def _polygon(data):
+    """Return new Polygon (or None) from bytes produced by pack."""
+    p = unpack(data)
+    if p is None:
+        return None
+    return Polygon(p)
+
+def _integers(p):
+    """Return Polygon with the coordinates of p, as ints."""
+    return Polygon([Point(int(pt.x()), int(pt.y())) for pt in p])
+
+def _intersectPacked(task):
+    """
+    Worker computing intersection of packed pair (index, p, q, exact,
+    robust), where exact tells that p and q had int coordinates before
+    packing, and robust is poly.util.robust in the calling process.
+    """
+    index, p, q, exact, robust = task
+    poly.util.robust = robust
+    p = unpack(p)
+    q = unpack(q)
+    if exact:
+        p = _integers(p)
+        q = _integers(q)
+    return (index, pack(convexIntersect(p, q)))
+
+def convexIntersectMany(pairs, workers=None, chunksize=64, ordered=True):
+    """
+    Generate intersections of each pair (p,q) of convex polygons, as
+    computed by convexIntersect, using a pool of worker processes; the
+    default is one per CPU. Pairs are handed to workers chunksize at a
+    time, and read from pairs a batch at a time, with at most two
+    batches of 2*chunksize pairs per worker in flight, so pairs may be
+    a generator too large to fit in memory. If ordered, results are
+    generated in the order of pairs;
+    otherwise (index, result) tuples are generated as soon as each
+    result is complete. Results are new Polygon objects (or None) whose
+    coordinates are floats, even when convexIntersect would return p
+    or q itself. With a single worker, pairs are intersected in this
+    process, and results are converted the same way. Either way, pairs
+    with int coordinates are intersected exactly, so they give the same
+    values whatever the number of workers. Workers use exact orientation
+    tests when poly.util.robust is set here.
+    """
+    if workers == 1:
+        for index, (p, q) in enumerate(pairs):
+            result = _polygon(pack(convexIntersect(p, q)))
+            if ordered:
+                yield result
+            else:
+                yield (index, result)
+        return
+
+    # the pool reads all tasks given to it at once, so hand it one batch
+    # while the previous one finishes
+    size = 2 * chunksize * (workers or cpu_count())
+    robust = poly.util.robust
+    tasks = ((index, pack(p), pack(q), _integral(p) and _integral(q), robust)
+             for index, (p, q) in enumerate(pairs))
+    with Pool(workers) as pool:
+        pending = None
+        while True:
+            batch = list(islice(tasks, size))
+            results = None
+            if batch:
+                if ordered:
+                    results = pool.imap(_intersectPacked, batch, chunksize)
+                else:
+                    results = pool.imap_unordered(_intersectPacked, batch, chunksize)
+            if pending is not None:
+                for index, data in pending:
+                    result = _polygon(data)
+                    if ordered:
+                        yield result
+                    else:
+                        yield (index, result)
+            if results is None:
+                break
+            pending = results
+
+def _extremeLeft(q, x1, y1, dx, dy, j):
+    """
+    Starting from vertex j of convex polygon q, walk counter-clockwise
+    while vertices move further to the left of the line through (x1,y1)
+    in direction (dx,dy). Return (j, distance), where distance is the
+    cross product for the last vertex.
+    """
+    m = q.numPoints()
+    pt = q.get(j)
+    best = dx*(pt.y() - y1) - dy*(pt.x() - x1)
+    for step in range(m):
+        pt = q.get((j+1) % m)
+        d = dx*(pt.y() - y1) - dy*(pt.x() - x1)
+        if d <= best:
+            break
+        j = (j+1) % m
+        best = d
+    return (j, best)
+
+def _separatingEdgeOf(p, q):
+    """
+    Return index of an edge of p that has all of q strictly to its
+    right, or None. The vertex of q furthest to the left of each edge
+    moves counter-clockwise as the edges of p do, so all edges of p are
+    checked in O(n + m) time.
+    """
+    n = p.numPoints()
+    j = 0
+    for i in range(n):
+        a = p.get(i)
+        b = p.get((i+1) % n)
+        x1 = a.x()
+        y1 = a.y()
+        dx = b.x() - x1
+        dy = b.y() - y1
+        if i == 0:
+            # full scan once, to find where to start
+            best = None
+            for k in range(q.numPoints()):
+                pt = q.get(k)
+                d = dx*(pt.y() - y1) - dy*(pt.x() - x1)
+                if best is None or d > best:
+                    j = k
+                    best = d
+        else:
+            j, best = _extremeLeft(q, x1, y1, dx, dy, j)
+        if best < -epsilon:
+            return i
+    return None
+
+def _separates(p, q, i):
+    """Determine if edge i of p has all of q strictly to its right."""
+    n = p.numPoints()
+    a = p.get(i)
+    b = p.get((i+1) % n)
+    x1 = a.x()
+    y1 = a.y()
+    dx = b.x() - x1
+    dy = b.y() - y1
+    for k in range(q.numPoints()):
+        pt = q.get(k)
+        if dx*(pt.y() - y1) - dy*(pt.x() - x1) >= -epsilon:
+            return False
+    return True
+
+def separatingEdge(p, q, hint=None):
+    """
+    Determine whether convex polygons p and q, in standard form, are
+    disjoint, without creating any edges, points or polygons. Return
+    None if they overlap (or touch); otherwise return (0, i) if edge i
+    of p separates them, or (1, i) if edge i of q does. A result from an
+    earlier call can be passed as hint, and is checked first, which is
+    cheap when polygons move only a little between calls.
+    """
+    if hint is not None:
+        k, i = hint
+        if k == 0 and i < p.numPoints() and _separates(p, q, i):
+            return hint
+        if k == 1 and i < q.numPoints() and _separates(q, p, i):
+            return hint
+
+    i = _separatingEdgeOf(p, q)
+    if i is not None:
+        return (0, i)
+    i = _separatingEdgeOf(q, p)
+    if i is not None:
+        return (1, i)
+    return None
+
+def convexOverlap(p, q):
+    """
+    Determine if convex polygons p and q, in standard form, overlap
+    (or touch), using the separating axis test of separatingEdge.
+    """
+    return separatingEdge(p, q) is None
+
+def _direction(p, i):
+    """Return (dx, dy) of edge i of p."""
+    a = p.get(i % p.numPoints())
+    b = p.get((i+1) % p.numPoints())
+    return (b.x() - a.x(), b.y() - a.y())
+
+def _before(rx, ry, u, v):
+    """
+    Determine if direction u comes strictly before direction v, when
+    turning counter-clockwise from the reference direction (rx,ry).
+    """
+    halfU = 0 if rx*u[1] - ry*u[0] > 0 or (rx*u[1] - ry*u[0] == 0 and rx*u[0] + ry*u[1] > 0) else 1
+    halfV = 0 if rx*v[1] - ry*v[0] > 0 or (rx*v[1] - ry*v[0] == 0 and rx*v[0] + ry*v[1] > 0) else 1
+    if halfU != halfV:
+        return halfU < halfV
+    return u[0]*v[1] - u[1]*v[0] > 0
+
+def convexOverlapLog(p, q):
+    """
+    Determine if convex polygons p and q, in standard form, overlap
+    (or touch), reading only O(log n * log m) of their vertices.
+
+    They overlap exactly when the origin is within the Minkowski
+    difference of p and -q, whose edges are those of p and -q merged by
+    angle. The kth vertex of the difference is found by a binary search
+    for how many of the first k edges come from p, so the difference
+    is never built; containedWithin's wedge search then locates the
+    origin.
+    """
+    n = p.numPoints()
+    m = q.numPoints()
+    (rx, ry) = _direction(p, 0)
+
+    def edgeQ(j):
+        """Direction of jth edge of -q, once rotated to start at b."""
+        (dx, dy) = _direction(q, b + j)
+        return (-dx, -dy)
+
+    # edges of -q are sorted by angle, rotated so that b comes first
+    b = 0
+    lo, hi = 1, m
+    first = edgeQ(0)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _before(rx, ry, edgeQ(mid), first):
+            hi = mid
+        else:
+            lo = mid + 1
+    b = lo % m
+
+    def vertex(k):
+        """Return (x,y) of kth vertex of the Minkowski difference."""
+        lo = max(0, k - m)
+        hi = min(k, n)
+        while lo < hi:
+            i = (lo + hi) // 2
+            j = k - i
+            if not _before(rx, ry, edgeQ(j-1), _direction(p, i)):
+                lo = i + 1
+            else:
+                hi = i
+        a = p.get(lo % n)
+        c = q.get((b + k - lo) % m)
+        return (a.x() - c.x(), a.y() - c.y())
+
+    (x0, y0) = vertex(0)
+    (x1, y1) = vertex(1)
+    (xl, yl) = vertex(n+m-1)
+    if computeAngleSign(x0, y0, x1, y1, 0, 0) < 0:
+        return False
+    if computeAngleSign(x0, y0, xl, yl, 0, 0) > 0:
+        return False
+
+    # find last diagonal (0,k) that has origin on its left
+    lo, hi = 1, n+m-2
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        (x, y) = vertex(mid)
+        if computeAngleSign(x0, y0, x, y, 0, 0) >= 0:
+            lo = mid
+        else:
+            hi = mid - 1
+
+    (xa, ya) = vertex(lo)
+    (xb, yb) = vertex(lo+1)
+    if computeAngleSign(xa, ya, xb, yb, 0, 0) < 0:
+        return False
+
+    # parallel edges of p and q leave collinear vertices, so the wedge
+    # may be flat, with the origin on its line but beyond it
+    if computeAngleSign(x0, y0, xa, ya, xb, yb) == 0:
+        return (min(x0, xa, xb) <= 0 <= max(x0, xa, xb) and
+                min(y0, ya, yb) <= 0 <= max(y0, ya, yb))
+    return True
+
+def _lowest(p):
+    """Return index of lowest point of p, leftmost among ties."""
+    return min(range(p.numPoints()), key=lambda i: (p.get(i).y(), p.get(i).x()))
+
+def minkowskiSum(p, q):
+    """
+    Compute Minkowski sum of convex polygons p and q, in standard form,
+    as a convex polygon in standard form, in O(n+m) time.
+
+    Starting from the sum of their lowest points, the edges of p and
+    q are taken in order of angle, which they already are within each
+    polygon, so this is a merge. Parallel edges are taken together, so
+    the sum has no collinear points.
+    """
+    n = p.numPoints()
+    m = q.numPoints()
+    if n == 0 or m == 0:
+        return Polygon()
+    a = _lowest(p)
+    b = _lowest(q)
+    edgesP = n if n > 1 else 0
+    edgesQ = m if m > 1 else 0
+
+    # sum points of p and q rather than edges, so errors don't add up
+    result = Polygon()
+    i = j = 0
+    while True:
+        u = p.get((a + i) % n)
+        v = q.get((b + j) % m)
+        result.add(u.x() + v.x(), u.y() + v.y())
+        if i == edgesP and j == edgesQ:
+            break
+        if j == edgesQ:
+            i += 1
+        elif i == edgesP:
+            j += 1
+        else:
+            du = _direction(p, a + i)
+            dv = _direction(q, b + j)
+            if _before(1, 0, du, dv):
+                i += 1
+            elif _before(1, 0, dv, du):
+                j += 1
+            else:
+                i += 1
+                j += 1
+
+    # last point was the first one again, and like computeHull,
+    # start from the leftmost point instead
+    if result.numPoints() > 1:
+        result.remove(-1)
+    first = min(range(result.numPoints()), key=lambda i: (result.get(i).x(), result.get(i).y()))
+    return Polygon(result.points[first:] + result.points[:first])
+
+def minkowskiDifference(p, q):
+    """
+    Compute Minkowski difference of convex polygons p and q, in standard
+    form: the sum of p and q reflected through the origin, holding a-b
+    for all points a in p and b in q. It contains the origin exactly
+    when p and q overlap.
+    """
+    return minkowskiSum(p, Polygon([Point(-pt.x(), -pt.y()) for pt in q]))
+
+def _closest(x1, y1, x2, y2):
+    """Return point closest to the origin on segment from (x1,y1) to (x2,y2)."""
+    dx = x2 - x1
+    dy = y2 - y1
+    length = dx*dx + dy*dy
+    if length == 0:
+        return (x1, y1)
+    t = max(0, min(1, -(x1*dx + y1*dy) / length))
+    return (x1 + t*dx, y1 + t*dy)
+
+def penetration(p, q):
+    """
+    Return (depth, dx, dy) where (dx,dy) is the shortest translation of
+    convex polygon q that leaves it touching convex polygon p, both in
+    standard form. When they overlap, depth is the length of (dx,dy),
+    the penetration depth; when they are apart, depth is minus that
+    length, so -depth is the distance between them. Return None if
+    either polygon is empty.
+    """
+    d = minkowskiDifference(p, q)
+    n = d.numPoints()
+    if n == 0:
+        return None
+
+    # moving q by (dx,dy) moves the difference by (-dx,-dy), so q
+    # touches p when (dx,dy) is on the boundary of the difference
+    inside = d.valid()
+    best = None
+    for i in range(n):
+        a = d.get(i)
+        b = d.get((i+1) % n)
+        if inside and computeAngleSign(a.x(), a.y(), b.x(), b.y(), 0, 0) < 0:
+            inside = False
+        (x, y) = _closest(a.x(), a.y(), b.x(), b.y())
+        dist = x*x + y*y
+        if best is None or dist < best[0]:
+            best = (dist, x, y)
+
+    (dist, x, y) = best
+    dist = sqrt(dist)
+    return (dist if inside else -dist, x, y)
+
+class ConvexIntersector:
+    """
+    Intersects a pair of convex polygons over and over as they move,
+    such as once per frame of an animation. When the polygons only move
+    a little, the edges that intersected first last time are still
+    close to intersecting, so the walk starts there rather than at the
+    first edge of each polygon; when they were apart, the edge that
+    separated them last time is checked first.
+
+    Whether to intersect exactly, as convexIntersect does for int
+    coordinates, is decided once, on the first call after creation or
+    reset(), rather than by scanning both polygons every call. Polygons
+    that later move off int coordinates, such as after a rotate(), are
+    still intersected exactly, only more slowly.
+    """
+
+    def __init__(self, exact=None):
+        """
+        Create intersector with no memory of earlier calls. If exact is
+        True or False, use or avoid exact arithmetic rather than decide.
+        """
+        self.edges = None      # (pi, qi) of edges that intersected first
+        self.witness = None    # separating edge, as from separatingEdge
+        self.exact = exact
+        self._exact = exact    # decision in effect until reset
+
+    def reset(self):
+        """Forget earlier calls, such as when polygons are replaced."""
+        self.edges = None
+        self.witness = None
+        self._exact = self.exact
+
+    def intersect(self, p, q):
+        """
+        Compute intersection of convex polygons p and q, the same as
+        convexIntersect, though the intersection may start from a
+        different vertex.
+        """
+        if self.witness is not None:
+            witness = separatingEdge(p, q, self.witness)
+            if witness is not None:
+                self.witness = witness
+                return None
+            self.witness = None
+
+        pi = qi = 0
+        if self.edges is not None:
+            if self.edges[0] < p.numEdges() and self.edges[1] < q.numEdges():
+                pi, qi = self.edges
+
+        if self._exact is None:
+            self._exact = _integral(p) and _integral(q)
+        exact = self._exact
+        intersection, edges = _walk(p, q, pi, qi, exact)
+        if intersection.numPoints() == 0 and (pi, qi) != (0, 0):
+            # hint is stale, so start over
+            intersection, edges = _walk(p, q, 0, 0, exact)
+
+        self.edges = edges
+        if intersection.numPoints() == 0:
+            result = _noCrossing(p, q)
+            if result is None:
+                self.witness = separatingEdge(p, q)
+            return result
+        return intersection
@@ -8,11 +8,13 @@
 """
 
 from poly.point import Point
-from poly.util import value, intersect
+from poly.util import value, intersect, intersectExact
 
 class Edge:
     """Represents an edge in Cartesian space."""
 
+    __slots__ = ('_head', '_tail', '_next')
+
     def __init__(self, head, tail):
         """
         Creates an edge for consecutive points head and tail.
@@ -48,20 +50,45 @@ class Edge:
 
     def intersect(self, e):
         """Return intersection between two edges (aside from end-points)."""
-        if self.head() == e.head() or self.head() == e.tail():
+        head = self._head
+        tail = self._tail
+        ehead = e._head
+        etail = e._tail
+        if head == ehead or head == etail:
             return None
-        if self.tail() == e.head() or self.tail() == e.tail():
+        if tail == ehead or tail == etail:
             return None
 
         # compute intersection of two line segments using x,y coords
-        pt = intersect(self.head().x(),
-                       self.head().y(),
-                       self.tail().x(),
-                       self.tail().y(),
-                       e.head().x(),
-                       e.head().y(),
-                       e.tail().x(),
-                       e.tail().y())
+        pt = intersect(head.x(),
+                       head.y(),
+                       tail.x(),
+                       tail.y(),
+                       ehead.x(),
+                       ehead.y(),
+                       etail.x(),
+                       etail.y())
+        if pt is None:
+            return None
+        return Point (pt[0], pt[1])
+
+    def intersectExact(self, e):
+        """
+        Return intersection between two edges (aside from end-points)
+        whose points have int (or float) coordinates, as a point whose
+        coordinates are exact Fraction objects.
+        """
+        head = self._head
+        tail = self._tail
+        ehead = e._head
+        etail = e._tail
+        if head == ehead or head == etail:
+            return None
+        if tail == ehead or tail == etail:
+            return None
+
+        pt = intersectExact(head.x(), head.y(), tail.x(), tail.y(),
+                            ehead.x(), ehead.y(), etail.x(), etail.y())
         if pt is None:
             return None
         return Point (pt[0], pt[1])
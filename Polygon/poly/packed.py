@@ -0,0 +1,168 @@
+"""
+    Defined polygon structure whose points are packed into one array.
+
+    A Polygon keeps a separate Point object for every vertex, which
+    costs hundreds of bytes each. A PackedPolygon instead stores all
+    coordinates in a single array('d') of alternating x and y values,
+    or 16 bytes per vertex. Points are handed out as PointView objects
+    that read and write the array on demand, so all Polygon methods,
+    as well as convexIntersect and computeHull, work unchanged.
+
+    A PointView refers to a position in the polygon, so it no longer
+    refers to the same vertex once an earlier point has been removed.
+    Coordinates are always stored as floats.
+"""
+
+from array import array
+from poly.point import Point
+from poly.polygon import Polygon
+
+class PointView(Point):
+    """Represents a point stored in the coordinates of a PackedPolygon."""
+
+    __slots__ = ('_coords', '_index')
+
+    def __init__(self, coords, index):
+        """Creates view of point whose x value is at coords[index]."""
+        self._coords = coords
+        self._index = index
+
+    def copy(self):
+        """Return copy of a point, detached from the polygon."""
+        return Point(self._coords[self._index], self._coords[self._index+1])
+
+    def x(self):
+        """Return x value of point."""
+        return self._coords[self._index]
+
+    def y(self):
+        """Return y value of point."""
+        return self._coords[self._index+1]
+
+    def set(self, x, y):
+        """Update the (x,y) values for a Point."""
+        self._coords[self._index] = x
+        self._coords[self._index+1] = y
+
+    def __str__(self):
+        """Return string representation of point."""
+        return "({},{})".format(self.x(), self.y())
+
+class PackedPoints:
+    """Sequence of PointView objects over an array of coordinates."""
+
+    def __init__(self, coords):
+        """Wrap array of alternating x and y coordinates."""
+        self.coords = coords
+
+    def __len__(self):
+        """Return the number of points."""
+        return len(self.coords) // 2
+
+    def _index(self, n):
+        """Return position in coords of the x value of nth point."""
+        count = len(self.coords) // 2
+        if n < 0:
+            n += count
+        if n < 0 or n >= count:
+            raise IndexError("point index out of range")
+        return 2*n
+
+    def __getitem__(self, n):
+        """Return view of nth point (based on zero)."""
+        if isinstance(n, slice):
+            return [self[i] for i in range(*n.indices(len(self)))]
+        return PointView(self.coords, self._index(n))
+
+    def __delitem__(self, n):
+        """Delete the nth point (based on zero)."""
+        idx = self._index(n)
+        del self.coords[idx:idx+2]
+
+    def __iter__(self):
+        """Return views of points in order."""
+        for idx in range(0, len(self.coords) - 1, 2):
+            yield PointView(self.coords, idx)
+
+    def append(self, pt):
+        """Extend with coordinates of point pt."""
+        self.coords.append(pt.x())
+        self.coords.append(pt.y())
+
+    def __eq__(self, other):
+        """Equal to any sequence of the same points."""
+        if isinstance(other, PackedPoints):
+            return self.coords == other.coords
+        try:
+            if len(self) != len(other):
+                return False
+        except TypeError:
+            return False
+        for pt, o in zip(self, other):
+            if pt != o:
+                return False
+        return True
+
+    def __ne__(self, other):
+        """Standard not-equality check."""
+        return not self.__eq__(other)
+
+class PackedPolygon(Polygon):
+    """Represents polygon whose points are packed in a single array."""
+
+    def __init__(self, pts=[], coords=None):
+        """
+        Creates polygon from list of points, which can be another polygon.
+        Alternatively, use coords, an array('d') of alternating x and y
+        values, which is used directly and not copied.
+        """
+        if coords is None:
+            if isinstance(pts, PackedPolygon):
+                coords = array('d', pts.points.coords)
+            else:
+                coords = array('d')
+                for pt in pts:
+                    coords.append(pt.x())
+                    coords.append(pt.y())
+        self.points = PackedPoints(coords)
+        self._edges = None
+
+    def coords(self):
+        """Return the array of alternating x and y values."""
+        return self.points.coords
+
+    def copy(self):
+        """Return copy of polygon."""
+        return PackedPolygon(self)
+
+    def add(self, x, y):
+        """Extend polygon with additional (x,y) point."""
+        self.points.coords.append(x)
+        self.points.coords.append(y)
+        self._edges = None
+
+    def segments(self):
+        """Return edges in the polygon, in order, as (x1,y1,x2,y2) tuples."""
+        c = self.points.coords
+        order = []
+        for i in range(0, len(c) - 3, 2):
+            order.append((c[i], c[i+1], c[i+2], c[i+3]))
+
+        if self.valid():
+            order.append((c[-2], c[-1], c[0], c[1]))
+        return order
+
+    def bounds(self):
+        """Return bounding box (xmin, ymin, xmax, ymax), or None if empty."""
+        if self._transform is not None:
+            return Polygon.bounds(self)
+        c = self.points.coords
+        if len(c) == 0:
+            return None
+        xs = c[0::2]
+        ys = c[1::2]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def __len__(self):
+        """Return the number of points, so polygon can be used as a list."""
+        return len(self._points)
@@ -3,11 +3,18 @@
 
     Constructing a point class makes it possible to easily
     query or modify points in a polygon.
+
+    Points use __slots__, so they carry no per-instance dictionary.
+    Because a Point can be modified, it cannot be hashed. Use frozen()
+    to get an immutable FrozenPoint that can be stored in a set or
+    used as a dictionary key, for example to remove duplicates.
 """
 
 class Point:
     """Represents a point in Cartesian space."""
 
+    __slots__ = ('_x', '_y')
+
     def __init__(self, x, y):
         """Creates a point (x,y) in Cartesian space."""
         self._x = x
@@ -17,6 +24,10 @@ class Point:
         """Return copy of a point."""
         return Point(self._x, self._y)
 
+    def frozen(self):
+        """Return immutable, hashable copy of a point."""
+        return FrozenPoint(self.x(), self.y())
+
     def x(self):
         """Return x value of point."""
         return self._x
@@ -36,11 +47,28 @@ class Point:
 
     def __eq__(self, other):
         """Standard equality check."""
-        if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+        if isinstance(other, Point):
+            return self.x() == other.x() and self.y() == other.y()
         else:
             return False
 
     def __ne__(self, other):
         """Standard not-equality check."""
         return not self.__eq__(other)
+
+class FrozenPoint(Point):
+    """Represents a point in Cartesian space that cannot be modified."""
+
+    __slots__ = ()
+
+    def frozen(self):
+        """Return self, since point is already immutable."""
+        return self
+
+    def set(self, x, y):
+        """FrozenPoint cannot be modified."""
+        raise AttributeError("Can't modify the (x,y) values of FrozenPoint")
+
+    def __hash__(self):
+        """Hash consistent with equality against any Point."""
+        return hash((self._x, self._y))
@@ -4,15 +4,27 @@
     Using Point objects, rather than tuples or arrays, makes it 
     easier to manipulate.
 
-    Can choose to store edges in addition to speed up this code. The 
-    Polygon is always assumed to be "closed", that is, once three or
+    Edges are stored in addition to speed up this code. The ring of
+    edges is built on first use and kept until add() or remove() changes
+    the points. Because each Edge refers to the very Point objects of
+    the polygon, updating a point with set() is seen by the edges too.
+    The Polygon is always assumed to be "closed", that is, once three or
     more points exist, then there is a final closing edge from the 
     final point, back to the first point.
+
+    Moving a polygon with translate(), rotate() or scale() takes O(1)
+    time. These only record an affine transform, which is applied to
+    every point, with set(), the next time the points are needed. In
+    the meantime, bounds() and getCoordinates() account for the pending
+    transform without applying it, so a polygon that moves many times
+    between uses only has its points updated once.
 """
 
+from math import cos, sin
 from poly.point import Point
 from poly.edge import Edge
 from poly.util import computeAngleSign
+from poly.sweep import findIntersection, findIntersections
 
 class Polygon:
     """Represents polygon of points in Cartesian space."""
@@ -21,9 +33,76 @@ class Polygon:
         """
         Creates polygon from list of points. If omitted, polygon is empty.
         """
-        self.points = []
-        for pt in pts:
-            self.points.append(pt.copy())
+        self.points = [pt.copy() for pt in pts]
+        self._edges = None
+
+    @property
+    def points(self):
+        """List of points, once any pending transform is applied."""
+        if self._transform is not None:
+            self._applyTransform()
+        return self._points
+
+    @points.setter
+    def points(self, pts):
+        """Replace list of points, discarding any pending transform and edges."""
+        self._points = pts
+        self._transform = None
+        self._edges = None
+
+    def _applyTransform(self):
+        """Apply pending transform to every point."""
+        (a, b, c, d, e, f) = self._transform
+        self._transform = None
+        if a == 1 and b == 0 and c == 0 and d == 1:
+            for pt in self._points:
+                pt.set(pt.x() + e, pt.y() + f)
+        else:
+            for pt in self._points:
+                x = pt.x()
+                y = pt.y()
+                pt.set(a*x + b*y + e, c*x + d*y + f)
+
+    def transform(self, a, b, c, d, e, f):
+        """
+        Transform polygon so each point (x,y) moves to (a*x + b*y + e,
+        c*x + d*y + f). Only recorded, in O(1) time, until points are
+        needed; combined with any transform still pending.
+        """
+        if self._transform is None:
+            self._transform = (a, b, c, d, e, f)
+        else:
+            (a1, b1, c1, d1, e1, f1) = self._transform
+            self._transform = (a*a1 + b*c1, a*b1 + b*d1,
+                               c*a1 + d*c1, c*b1 + d*d1,
+                               a*e1 + b*f1 + e, c*e1 + d*f1 + f)
+
+    def translate(self, dx, dy):
+        """Move polygon by (dx,dy)."""
+        self.transform(1, 0, 0, 1, dx, dy)
+
+    def rotate(self, angle, x=0, y=0):
+        """Rotate polygon counter-clockwise by angle (in radians) around (x,y)."""
+        c = cos(angle)
+        s = sin(angle)
+        self.transform(c, -s, s, c, x - c*x + s*y, y - s*x - c*y)
+
+    def scale(self, sx, sy=None, x=0, y=0):
+        """Scale polygon by sx horizontally and sy (default sx) vertically around (x,y)."""
+        if sy is None:
+            sy = sx
+        self.transform(sx, 0, 0, sy, x - sx*x, y - sy*y)
+
+    def getCoordinates(self, n):
+        """
+        Return (x,y) of the nth point, with any pending transform taken
+        into account, but without applying it to the polygon.
+        """
+        pt = self._points[n]
+        if self._transform is None:
+            return (pt.x(), pt.y())
+        (a, b, c, d, e, f) = self._transform
+        return (a*pt.x() + b*pt.y() + e, c*pt.x() + d*pt.y() + f)
 
     def copy(self):
         """Return copy of polygon."""
@@ -32,7 +111,7 @@ class Polygon:
     def add(self, x, y):
         """Extend polygon with additional (x,y) point."""
         self.points.append(Point(x,y))
-        n = len(self.points)
+        self._edges = None
 
     def get(self, n):
         """Returns the nth point from polygon (based on zero)."""
@@ -41,23 +120,24 @@ class Polygon:
     def remove(self, n):
         """Delete the nth point from polygon (based on zero)."""
         del self.points[n]
+        self._edges = None
 
     def numPoints(self):
         """Return the number of points in polygon."""
-        return len(self.points)
+        return len(self._points)
 
     def numEdges(self):
         """Return the number of edges in polygon."""
-        if len(self.points) < 1:
+        if len(self._points) < 1:
             return 0
-        elif len(self.points) == 2:
+        elif len(self._points) == 2:
             return 1
         else:
-            return len(self.points)
+            return len(self._points)
 
     def valid(self):
         """A polygon becomes valid with three or more points."""
-        return len(self.points) >= 3
+        return len(self._points) >= 3
 
     def convex(self):
         """
@@ -90,45 +170,168 @@ class Polygon:
     def simple(self):
         """
         Determine if a polygon is simple, that is, doesn't have 
-        two different edges that intersect each other.
-        """
-        all = list(self.edges())
-        for i in range(0, len(all)-1):
-            e = all[i]
-            for j in range(i+1, len(all)):
-                if e.intersect(all[j]):
-                    return False
-        
-        return True
+        two different edges that intersect each other. Uses a
+        sweep line to do so in O(n log n) time.
+        """
+        return findIntersection(self.segments()) is None
+
+    def selfIntersections(self):
+        """
+        Return sorted list of all pairs (i,j) of edges that intersect
+        each other, where edge i is the ith edge returned by edges().
+        """
+        return findIntersections(self.segments())
 
     def intersect(self, p):
-        """Return true if two polygons intersect. Checks edges."""
-        for e in self.edges():
-            for o in p.edges():
-                if e.intersect(o) is not None:
-                    return True
-        return False
+        """
+        Return true if two polygons intersect, that is, their edges
+        intersect or one polygon lies inside the other. Rejects on
+        bounding boxes first, then sweeps over edges of both polygons.
+        """
+        mine = self.bounds()
+        other = p.bounds()
+        if mine is None or other is None:
+            return False
+        if mine[2] < other[0] or other[2] < mine[0]:
+            return False
+        if mine[3] < other[1] or other[3] < mine[1]:
+            return False
+
+        segments = self.segments()
+        groups = [0] * len(segments)
+        others = p.segments()
+        segments.extend(others)
+        groups.extend([1] * len(others))
+        if findIntersection(segments, groups) is not None:
+            return True
+
+        return self.encloses(p) or p.encloses(self)
+
+    def encloses(self, p):
+        """
+        Return true if p lies inside polygon, assuming that the edges
+        of the two polygons do not intersect. Points of p that are on
+        the boundary of the polygon are inconclusive, and if all of them
+        are, the two polygons share their boundary.
+        """
+        if not self.valid():
+            return False
+
+        for pt in p:
+            where = self.locate(pt.x(), pt.y())
+            if where != 0:
+                return where > 0
+
+        for (x1, y1, x2, y2) in p.segments():
+            where = self.locate((x1 + x2)/2, (y1 + y2)/2)
+            if where != 0:
+                return where > 0
+        return True
+
+    def locate(self, x, y):
+        """
+        Return +1 if point (x,y) is inside polygon, 0 if on its boundary
+        and -1 if outside. Counts how many edges are crossed by a ray
+        heading right from (x,y), so polygon need not be convex.
+        """
+        inside = False
+        for e in self._edgeRing():
+            x1 = e.head().x()
+            y1 = e.head().y()
+            x2 = e.tail().x()
+            y2 = e.tail().y()
+            sign = computeAngleSign(x1, y1, x2, y2, x, y)
+            if sign == 0:
+                if min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2):
+                    return 0
+            elif (y1 > y) != (y2 > y) and (sign > 0) == (y2 > y1):
+                inside = not inside
+
+        if inside:
+            return +1
+        return -1
+
+    def bounds(self):
+        """
+        Return bounding box (xmin, ymin, xmax, ymax), or None if empty.
+        A pending transform is accounted for, but not applied.
+        """
+        if len(self._points) == 0:
+            return None
+        if self._transform is None:
+            xs = [pt.x() for pt in self._points]
+            ys = [pt.y() for pt in self._points]
+            return (min(xs), min(ys), max(xs), max(ys))
+
+        (a, b, c, d, e, f) = self._transform
+        if b == 0 and c == 0:
+            # axis-aligned, so transform bounds of original points
+            xs = [pt.x() for pt in self._points]
+            ys = [pt.y() for pt in self._points]
+            x1 = a*min(xs) + e
+            x2 = a*max(xs) + e
+            y1 = d*min(ys) + f
+            y2 = d*max(ys) + f
+            return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+        xs = [a*pt.x() + b*pt.y() + e for pt in self._points]
+        ys = [c*pt.x() + d*pt.y() + f for pt in self._points]
+        return (min(xs), min(ys), max(xs), max(ys))
 
     def __iter__(self):
         """Return points in the polygon in order."""
         for pt in self.points:
             yield pt
 
+    def segments(self):
+        """Return edges in the polygon, in order, as (x1,y1,x2,y2) tuples."""
+        points = self.points
+        order = []
+        for i in range(0, len(points)-1):
+            head = points[i]
+            tail = points[i+1]
+            order.append((head.x(), head.y(), tail.x(), tail.y()))
+
+        if self.valid():
+            head = points[-1]
+            tail = points[0]
+            order.append((head.x(), head.y(), tail.x(), tail.y()))
+        return order
+
     def edges(self):
         """Return edges in the polygon, in order."""
+        return self._buildEdges()
+
+    def _edgeRing(self):
+        """
+        Return edges in the polygon, in order, as a tuple. The same
+        edges are returned until the polygon gains or loses a point, so
+        callers must not modify them. Cached edges share the points, so
+        a pending transform is applied to them first.
+        """
+        if self._transform is not None:
+            self._applyTransform()
+        if self._edges is None:
+            self._edges = tuple(self._buildEdges())
+        return self._edges
+
+    def _buildEdges(self):
+        """Return list of new edges in the polygon, in order."""
+        points = self.points
         order = []
-        for i in range(0, len(self.points)-1):
-            order.append(Edge(self.points[i], self.points[i+1]))
+        for i in range(0, len(points)-1):
+            order.append(Edge(points[i], points[i+1]))
 
         if self.valid():
-            n = len(self.points)
-            order.append(Edge(self.points[n-1], self.points[0]))
+            n = len(points)
+            order.append(Edge(points[n-1], points[0]))
 
         # Now link edges to next one in the chain. Make sure to
         # link back to start
         for i in range(len(order)-1):
             order[i].setNext(order[i+1])
-        order[-1].setNext(order[0])
+        if order:
+            order[-1].setNext(order[0])
         return order
                              
     def __str__(self):
@@ -140,8 +343,8 @@ class Polygon:
 
     def __eq__(self, other):
         """Standard equality check."""
-        if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+        if isinstance(other, Polygon):
+            return self.points == other.points
         else:
             return False
 
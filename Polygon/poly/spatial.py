@@ -0,0 +1,162 @@
+"""
+    Spatial index over bounding boxes using a uniform grid.
+
+    Each entry is a key together with its bounding box (xmin, ymin,
+    xmax, ymax), such as the one returned by Polygon.bounds(). The
+    plane is divided into square cells, and every key is recorded in
+    each cell that its box overlaps. Looking for boxes that overlap a
+    window then only needs to consider keys in the cells that the
+    window overlaps.
+
+    Finding all overlapping pairs inspects pairs of keys within each
+    cell. To report a pair only once, it is reported by the single cell
+    that contains the lower-left corner of the overlap of the two boxes.
+
+    Works best when boxes have similar sizes. If no cell size is given,
+    it is chosen from the average size of the boxes bulk-loaded. A box
+    that would cover more than MAX_CELLS cells is kept apart instead,
+    in a list that every query and search for pairs scans, so a box far
+    larger than the cells never fills the grid.
+"""
+
+from math import floor
+
+MAX_CELLS = 64
+
+def overlaps(a, b):
+    """Return True if bounding boxes a and b overlap (or touch)."""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+class GridIndex:
+    """Uniform grid of cells holding keys with bounding boxes."""
+
+    def __init__(self, cellSize=None):
+        """Create empty index, optionally with given cell size."""
+        self.cellSize = cellSize
+        self.bounds = {}      # key -> bounding box
+        self.cells = {}       # (i, j) -> set of keys
+        self.large = set()    # keys whose box covers too many cells
+
+    def __len__(self):
+        """Return the number of keys in the index."""
+        return len(self.bounds)
+
+    def __contains__(self, key):
+        """Determine whether key is in the index."""
+        return key in self.bounds
+
+    def _chooseSize(self, boxes):
+        """Choose cell size as average width and height of boxes."""
+        total = 0
+        for b in boxes:
+            total += (b[2] - b[0]) + (b[3] - b[1])
+        if total > 0:
+            self.cellSize = total / (2 * len(boxes))
+        else:
+            self.cellSize = 1
+
+    def _cells(self, box):
+        """Return range of cell indices overlapped by box."""
+        size = self.cellSize
+        return (floor(box[0] / size), floor(box[1] / size),
+                floor(box[2] / size), floor(box[3] / size))
+
+    def load(self, items):
+        """Bulk load iterable of (key, bounds) pairs."""
+        items = list(items)
+        if self.cellSize is None and items:
+            self._chooseSize([box for (key, box) in items])
+        for key, box in items:
+            self.insert(key, box)
+
+    def insert(self, key, box):
+        """Insert key with bounding box, replacing any previous entry."""
+        if key in self.bounds:
+            self.remove(key)
+        if self.cellSize is None:
+            self._chooseSize([box])
+
+        box = tuple(box)
+        self.bounds[key] = box
+        i0, j0, i1, j1 = self._cells(box)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > MAX_CELLS:
+            self.large.add(key)
+            return
+        for i in range(i0, i1+1):
+            for j in range(j0, j1+1):
+                cell = self.cells.get((i, j))
+                if cell is None:
+                    cell = self.cells[(i, j)] = set()
+                cell.add(key)
+
+    def remove(self, key):
+        """Remove key from the index. Raise KeyError if not present."""
+        box = self.bounds.pop(key)
+        if key in self.large:
+            self.large.remove(key)
+            return
+        i0, j0, i1, j1 = self._cells(box)
+        for i in range(i0, i1+1):
+            for j in range(j0, j1+1):
+                cell = self.cells[(i, j)]
+                cell.discard(key)
+                if not cell:
+                    del self.cells[(i, j)]
+
+    def query(self, window):
+        """Return list of keys whose bounding box overlaps window."""
+        if not self.bounds:
+            return []
+        i0, j0, i1, j1 = self._cells(window)
+        found = []
+        seen = set()
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self.cells):
+            # window covers more cells than are occupied
+            candidates = (cell for (pos, cell) in self.cells.items()
+                          if i0 <= pos[0] <= i1 and j0 <= pos[1] <= j1)
+        else:
+            candidates = (self.cells[(i, j)] for i in range(i0, i1+1)
+                          for j in range(j0, j1+1) if (i, j) in self.cells)
+
+        for cell in candidates:
+            for key in cell:
+                if key not in seen:
+                    seen.add(key)
+                    if overlaps(self.bounds[key], window):
+                        found.append(key)
+        for key in self.large:
+            if overlaps(self.bounds[key], window):
+                found.append(key)
+        return found
+
+    def pairs(self):
+        """Return list of all pairs of keys whose bounding boxes overlap."""
+        size = self.cellSize
+        found = []
+        for (i, j), cell in self.cells.items():
+            keys = list(cell)
+            for a in range(len(keys)-1):
+                ba = self.bounds[keys[a]]
+                for b in range(a+1, len(keys)):
+                    bb = self.bounds[keys[b]]
+                    if not overlaps(ba, bb):
+                        continue
+
+                    # only the cell holding corner of overlap reports pair
+                    if floor(max(ba[0], bb[0]) / size) != i:
+                        continue
+                    if floor(max(ba[1], bb[1]) / size) != j:
+                        continue
+                    found.append((keys[a], keys[b]))
+
+        # large boxes are checked against every other box
+        large = list(self.large)
+        for a in range(len(large)):
+            ba = self.bounds[large[a]]
+            for key, bb in self.bounds.items():
+                if key not in self.large and overlaps(ba, bb):
+                    found.append((large[a], key))
+            for b in range(a+1, len(large)):
+                if overlaps(ba, self.bounds[large[b]]):
+                    found.append((large[a], large[b]))
+        return found
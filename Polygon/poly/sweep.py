@@ -0,0 +1,200 @@
+"""
+    Sweep-line detection of intersecting line segments.
+
+    Shamos and Hoey [1976] showed that one can decide whether any two
+    of n line segments intersect in O(n log n) time by sweeping a
+    vertical line from left to right across the plane, only ever
+    testing segments that are neighbors along the sweep line. Bentley
+    and Ottmann [1979] extended the idea to report all k intersecting
+    pairs in O((n+k) log n) by also processing each intersection as an
+    event where the crossing segments swap places.
+
+    Segments are (x1, y1, x2, y2) tuples. Two segments intersect using
+    the same rules as Edge.intersect, that is, segments that share an
+    end-point never intersect, and neither do parallel segments.
+
+    The sweep line status is a Python list kept in bottom-to-top order
+    and searched with binary search using orientation tests, so no
+    divisions are needed to locate an event point.
+
+    The same sweep also finds, for each segment, the points within it
+    where another segment crosses it, or ends on it, or runs along it.
+    Splitting segments there, as findSplitPoints allows, leaves pieces
+    that only meet at their end-points, or coincide.
+"""
+
+from heapq import heapify, heappush, heappop
+from functools import cmp_to_key
+from poly.util import computeAngleSign, intersect
+
+def crossing(s, t):
+    """
+    Return intersection point of segments s and t (or None), applying
+    the rules of Edge.intersect.
+    """
+    if (s[0] == t[0] and s[1] == t[1]) or (s[0] == t[2] and s[1] == t[3]):
+        return None
+    if (s[2] == t[0] and s[3] == t[1]) or (s[2] == t[2] and s[3] == t[3]):
+        return None
+    return intersect(s[0], s[1], s[2], s[3], t[0], t[1], t[2], t[3])
+
+def findIntersection(segments, groups=None):
+    """
+    Return a pair (i,j) of intersecting segments, with i < j, or None
+    if no two segments intersect. When groups is given, only segments
+    from different groups are considered to intersect.
+    """
+    found = _sweep(segments, groups, True)
+    if found:
+        return found[0]
+    return None
+
+def findIntersections(segments, groups=None):
+    """
+    Return sorted list of all pairs (i,j) of intersecting segments, with
+    i < j. When groups is given, only segments from different groups
+    are considered to intersect.
+    """
+    return sorted(_sweep(segments, groups, False))
+
+def findSplitPoints(segments):
+    """
+    Return list with, for each segment, the sorted list of points other
+    than its end-points where it crosses or touches another segment.
+    """
+    splits = [set() for s in segments]
+    _sweep(segments, None, False, splits)
+    return [sorted(points) for points in splits]
+
+def _sweep(segments, groups, first, splits=None):
+    """
+    Sweep across segments from left to right and return list of pairs
+    of intersecting segments. If first is True, stop once one is found.
+    If splits is given, add to splits[i] each point within segment i
+    that is on another segment.
+    """
+    n = len(segments)
+    left = [None] * n
+    right = [None] * n
+    events = {}     # event point -> segments starting there
+    ends = {}       # event point -> segments ending there
+    for i in range(n):
+        s = segments[i]
+        a = (s[0], s[1])
+        b = (s[2], s[3])
+        if a == b:
+            raise ValueError("Can't sweep segment with two identical points")
+        if b < a:
+            a, b = b, a
+        left[i] = a
+        right[i] = b
+        events.setdefault(a, []).append(i)
+        events.setdefault(b, [])
+        ends.setdefault(b, []).append(i)
+
+    queue = list(events)
+    heapify(queue)
+    status = []
+    found = []
+    reported = set()
+
+    def report(i, j):
+        """Record that segments i and j intersect, if not yet known."""
+        if groups is not None and groups[i] == groups[j]:
+            return
+        pair = (i, j) if i < j else (j, i)
+        if pair not in reported:
+            reported.add(pair)
+            found.append(pair)
+
+    def check(i, j, p):
+        """Test neighbors i and j, scheduling their crossing if ahead of p."""
+        pt = crossing(segments[i], segments[j])
+        if pt is not None:
+            report(i, j)
+            if pt > p and pt not in events:
+                events[pt] = []
+                heappush(queue, pt)
+            if pt > p and splits is not None:
+                split(i, pt)
+                split(j, pt)
+
+    def split(i, p):
+        """Record that segment i is to be split at p, unless p is an end-point."""
+        if p != left[i] and p != right[i]:
+            splits[i].add(p)
+
+    def side(i, px, py):
+        """Return -1 if segment i passes below (px,py), 0 if through, +1 if above."""
+        a = left[i]
+        b = right[i]
+        return -computeAngleSign(a[0], a[1], b[0], b[1], px, py)
+
+    while queue:
+        p = heappop(queue)
+        px, py = p
+        starts = events.pop(p)
+
+        # binary search for block of segments passing through p
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if side(status[mid], px, py) < 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        hi = lo
+        while hi < len(status) and side(status[hi], px, py) == 0:
+            hi += 1
+        through = status[lo:hi]
+
+        # rounding may have left an ending segment out of order; evict it
+        for i in ends.get(p, ()):
+            if i not in through and i in status:
+                k = status.index(i)
+                del status[k]
+                if k < lo:
+                    lo -= 1
+                    hi -= 1
+                if 0 < k < len(status) and (k < lo or k > hi):
+                    check(status[k-1], status[k], p)
+
+        # segments passing through p are split there
+        if splits is not None:
+            for i in through:
+                split(i, p)
+
+        # every pair of segments touching p might intersect at p
+        touching = through + starts
+        for a in range(len(touching)-1):
+            for b in range(a+1, len(touching)):
+                if crossing(segments[touching[a]], segments[touching[b]]) is not None:
+                    report(touching[a], touching[b])
+        if first and found:
+            return found
+
+        # segments continuing past p are re-ordered by slope
+        def below(i, j):
+            s = computeAngleSign(px, py, right[i][0], right[i][1],
+                                 right[j][0], right[j][1])
+            if s != 0:
+                return -s
+            return i - j
+
+        block = [i for i in through if right[i] != p] + starts
+        block.sort(key=cmp_to_key(below))
+        status[lo:hi] = block
+
+        top = lo + len(block)
+        if block:
+            if lo > 0:
+                check(status[lo-1], status[lo], p)
+            if top < len(status):
+                check(status[top-1], status[top], p)
+        elif 0 < lo < len(status):
+            check(status[lo-1], status[lo], p)
+
+        if first and found:
+            return found
+
+    return found
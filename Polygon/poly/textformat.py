@@ -0,0 +1,315 @@
+"""
+    Read and write polygons as WKT or GeoJSON text.
+
+    Only the part of each format that describes simple polygons is
+    supported. In WKT, that is POLYGON and MULTIPOLYGON, possibly within
+    a GEOMETRYCOLLECTION; in GeoJSON, Polygon and MultiPolygon
+    geometries, bare or within a Feature, FeatureCollection or
+    GeometryCollection. Other geometries are skipped. A polygon with
+    holes can't be represented, so raises ValueError. The closing point
+    that repeats the first point of a ring is dropped when reading and
+    added when writing.
+
+    Readers are generators that consume the file a chunk at a time and
+    yield each polygon as soon as it has been read, so memory depends
+    on the size of the largest polygon rather than that of the file.
+    A GeoJSON FeatureCollection is decoded one feature at a time, and
+    files with one GeoJSON object per line work too. Writers accept
+    any iterable of polygons, writing each one as it arrives; None,
+    as returned by convexIntersect, is written as an empty polygon.
+"""
+
+import json
+import re
+from poly.polygon import Polygon
+
+CHUNK = 1 << 16
+
+def _ring(pts):
+    """Return Polygon from ring of (x,y) pairs, dropping closing point."""
+    p = Polygon()
+    for (x, y) in pts:
+        p.add(x, y)
+    if p.numPoints() > 1 and p.get(0) == p.get(-1):
+        p.remove(-1)
+    return p
+
+def _closed(p):
+    """Return list of (x,y) of polygon p, repeating the first point at the end."""
+    pts = [(pt.x(), pt.y()) for pt in p]
+    if pts:
+        pts.append(pts[0])
+    return pts
+
+def _number(x):
+    """Format number so that it is read back exactly."""
+    return str(x)
+
+# ---------------------------------------------------------------- WKT
+
+_PARENS = re.compile(r'[()]')
+_TAG = re.compile(r'\s*,?\s*([A-Za-z]+)(?:\s+(?:ZM|Z|M))?\s*(EMPTY\b|\()', re.IGNORECASE)
+
+def _groups(text):
+    """Return contents of each top-level parenthesized group in text."""
+    groups = []
+    depth = 0
+    for i, c in enumerate(text):
+        if c == '(':
+            if depth == 0:
+                start = i + 1
+            depth += 1
+        elif c == ')':
+            depth -= 1
+            if depth == 0:
+                groups.append(text[start:i])
+    return groups
+
+def _wktPolygon(body):
+    """Return Polygon from text within the parentheses of a WKT POLYGON."""
+    rings = _groups(body)
+    if len(rings) > 1:
+        raise ValueError("polygons with holes are not supported")
+    if not rings:
+        return Polygon()
+    pts = []
+    for pair in rings[0].split(','):
+        values = pair.split()
+        pts.append((float(values[0]), float(values[1])))
+    return _ring(pts)
+
+def _wktGeometry(tag, body):
+    """Generate polygons from WKT geometry with given tag and body."""
+    tag = tag.upper()
+    if tag == 'POLYGON':
+        yield _wktPolygon(body) if body is not None else Polygon()
+    elif tag == 'MULTIPOLYGON' and body is not None:
+        for group in _groups(body):
+            yield _wktPolygon(group)
+    elif tag == 'GEOMETRYCOLLECTION' and body is not None:
+        for p in readWKTString(body):
+            yield p
+
+def readWKTString(text):
+    """Generate polygons from WKT geometries in string."""
+    for p in readWKT([text]):
+        yield p
+
+def readWKT(f, chunk=CHUNK):
+    """
+    Generate polygons from open text file f, or any iterable of strings,
+    holding WKT geometries separated by whitespace (or commas).
+    """
+    if hasattr(f, 'read'):
+        source = iter(lambda: f.read(chunk), '')
+    else:
+        source = iter(f)
+
+    buf = ''
+    pos = 0
+    scan = None                # where to resume looking for parenthesis
+    depth = 0
+    eof = False
+    while True:
+        m = _TAG.match(buf, pos)
+        end = None
+        if m is not None and m.group(2).upper() == 'EMPTY':
+            end = m.end()
+            body = None
+        elif m is not None:
+            # find matching parenthesis
+            if scan is None:
+                scan = m.end() - 1
+                depth = 0
+            for paren in _PARENS.finditer(buf, scan):
+                depth += 1 if paren.group() == '(' else -1
+                if depth == 0:
+                    end = paren.end()
+                    body = buf[m.end():paren.start()]
+                    break
+            scan = len(buf)
+
+        if end is not None:
+            for p in _wktGeometry(m.group(1), body):
+                yield p
+            pos = end
+            scan = None
+            continue
+
+        if eof:
+            if buf[pos:].strip(' \t\r\n,'):
+                raise ValueError("invalid WKT: {!r}".format(buf[pos:pos+40]))
+            return
+        more = next(source, None)
+        if more is None:
+            eof = True
+        else:
+            buf = buf[pos:] + more
+            if scan is not None:
+                scan -= pos
+            pos = 0
+
+def writeWKT(f, polygons):
+    """Write each polygon to open text file f as a line of WKT."""
+    for p in polygons:
+        if p is None or p.numPoints() == 0:
+            f.write('POLYGON EMPTY\n')
+        else:
+            ring = ', '.join(_number(x) + ' ' + _number(y) for (x, y) in _closed(p))
+            f.write('POLYGON ((' + ring + '))\n')
+
+# ------------------------------------------------------------ GeoJSON
+
+_FEATURES = re.compile(r'"features"\s*:\s*\[')
+
+def _geoPolygon(rings):
+    """Return Polygon from coordinates of GeoJSON Polygon."""
+    if len(rings) > 1:
+        raise ValueError("polygons with holes are not supported")
+    if not rings:
+        return Polygon()
+    return _ring((pt[0], pt[1]) for pt in rings[0])
+
+def _geoPolygons(obj):
+    """Generate polygons from decoded GeoJSON object."""
+    if obj is None:
+        return
+    kind = obj.get('type')
+    if kind == 'Polygon':
+        yield _geoPolygon(obj['coordinates'])
+    elif kind == 'MultiPolygon':
+        for rings in obj['coordinates']:
+            yield _geoPolygon(rings)
+    elif kind == 'Feature':
+        for p in _geoPolygons(obj.get('geometry')):
+            yield p
+    elif kind == 'FeatureCollection':
+        for feature in obj['features']:
+            for p in _geoPolygons(feature):
+                yield p
+    elif kind == 'GeometryCollection':
+        for geometry in obj['geometries']:
+            for p in _geoPolygons(geometry):
+                yield p
+
+def _values(f, chunk, buf, inArray):
+    """
+    Generate JSON values from buf and then the rest of f, separated by
+    whitespace or commas. If inArray, stop at the closing bracket.
+    """
+    decoder = json.JSONDecoder()
+    pos = 0
+    eof = False
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\r\n,':
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                if inArray:
+                    raise ValueError("invalid GeoJSON: unterminated array")
+                return
+            buf = f.read(chunk)
+            pos = 0
+            eof = not buf
+            continue
+        if inArray and buf[pos] == ']':
+            return
+
+        try:
+            value, pos = decoder.raw_decode(buf, pos)
+        except ValueError:
+            if eof:
+                raise ValueError("invalid GeoJSON: {!r}".format(buf[pos:pos+40]))
+            more = f.read(max(chunk, len(buf) - pos))
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+        yield value
+
+def readGeoJSON(f, chunk=CHUNK):
+    """
+    Generate polygons from open text file f holding GeoJSON: a single
+    object, or a sequence of them such as one per line.
+    """
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk)
+    while True:
+        try:
+            decoder.raw_decode(buf.lstrip())
+            break
+        except ValueError:
+            pass
+
+        # a FeatureCollection too large for the buffer is streamed
+        m = _FEATURES.search(buf)
+        if m is not None:
+            for feature in _values(f, chunk, buf[m.end():], True):
+                for p in _geoPolygons(feature):
+                    yield p
+            return
+
+        more = f.read(max(chunk, len(buf)))
+        if not more:
+            break
+        buf += more
+
+    for value in _values(f, chunk, buf, False):
+        for p in _geoPolygons(value):
+            yield p
+
+def _geometry(p):
+    """Return GeoJSON geometry for polygon p, which may be None."""
+    if p is None or p.numPoints() == 0:
+        return {'type': 'Polygon', 'coordinates': []}
+    return {'type': 'Polygon', 'coordinates': [[list(pt) for pt in _closed(p)]]}
+
+class GeoJSONWriter:
+    """Writes polygons as features of a GeoJSON FeatureCollection, as they come."""
+
+    def __init__(self, f):
+        """Start FeatureCollection in open text file f."""
+        self.f = f
+        self.count = 0
+        f.write('{"type": "FeatureCollection", "features": [\n')
+
+    def write(self, p, properties=None):
+        """Write polygon p as a feature with given properties."""
+        feature = {'type': 'Feature',
+                   'geometry': _geometry(p),
+                   'properties': properties}
+        if self.count > 0:
+            self.f.write(',\n')
+        self.f.write(json.dumps(feature))
+        self.count += 1
+
+    def close(self):
+        """End the FeatureCollection."""
+        self.f.write('\n]}\n')
+
+    def __enter__(self):
+        """Use writer as context manager, which closes it when done."""
+        return self
+
+    def __exit__(self, *args):
+        """Close writer at end of with statement."""
+        self.close()
+
+def writeGeoJSON(f, polygons):
+    """Write each polygon to open text file f, as a FeatureCollection."""
+    with GeoJSONWriter(f) as writer:
+        for p in polygons:
+            writer.write(p)
+
+def readPolygons(path, chunk=CHUNK):
+    """
+    Generate polygons from file at path, read as GeoJSON if its name
+    ends with .json or .geojson, otherwise as WKT.
+    """
+    with open(path) as f:
+        if path.lower().endswith(('.json', '.geojson')):
+            polygons = readGeoJSON(f, chunk)
+        else:
+            polygons = readWKT(f, chunk)
+        for p in polygons:
+            yield p
@@ -3,10 +3,39 @@
 
     The intersect method will generate floating point values, and as 
     such, may introduce small errors because of precision errors.
+
+    The intersectMany method tests every pair of segments from two
+    collections at once. When NumPy is installed, it computes whole
+    blocks of pairs with array broadcasting; otherwise, or when robust
+    is set, it falls back to calling intersect for each pair.
+
+    Deciding orientation by comparing against a fixed epsilon is
+    wrong both for large coordinates, where rounding errors exceed it,
+    and for small ones, where it hides real turns. Setting robust to
+    True makes computeAngleSign and intersect use orient2d instead,
+    which computes the exact sign of the determinant: the floating
+    point result is used when it is larger than a proven bound on its
+    rounding error [Shewchuk, "Adaptive Precision Floating-Point
+    Arithmetic and Fast Robust Geometric Predicates", 1997], as it is
+    almost always, and exact rational arithmetic otherwise. Coordinates
+    must then be floats, or integers small enough to convert exactly.
 """
 
+from fractions import Fraction
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 epsilon = 1E-9
 
+# use exact orientation tests rather than epsilon
+robust = False
+
+# relative bound on error of determinant in orient2d, for IEEE doubles
+ccwErrorBound = (3.0 + 16.0 * 2.0**-53) * 2.0**-53
+
 def value(x):
     """Returns 0 if x is 'sufficiently close' to zero, +/- 1E-9"""
     if x >= 0 and x <= epsilon:
@@ -22,6 +51,9 @@ def computeAngleSign(x1, y1, x2, y2, x3, y3):
     triangle. So if positive, then left turn. If zero then colinear.
     If negative, then right turn.
     """
+    if robust:
+        return orient2d(x1, y1, x2, y2, x3, y3)
+
     val1 = (x2 - x1)*(y3 - y1)
     val2 = (y2 - y1)*(x3 - x1)
     diff = value(val1 - val2)
@@ -32,6 +64,54 @@ def computeAngleSign(x1, y1, x2, y2, x3, y3):
     else:
         return 0
 
+def orient2d(x1, y1, x2, y2, x3, y3):
+    """
+    Return +1 if p1-p2-p3 forms counterclockwise triangle, -1 if
+    clockwise and 0 if colinear, computing the sign of the determinant
+    exactly. Floating point is enough unless the result is within the
+    bound on its rounding error.
+    """
+    left = (x2 - x1)*(y3 - y1)
+    right = (y2 - y1)*(x3 - x1)
+    det = left - right
+    bound = ccwErrorBound * (abs(left) + abs(right))
+    if det > bound:
+        return +1
+    if -det > bound:
+        return -1
+
+    x1 = Fraction(x1)
+    y1 = Fraction(y1)
+    det = (Fraction(x2) - x1)*(Fraction(y3) - y1) - (Fraction(y2) - y1)*(Fraction(x3) - x1)
+    if det > 0:
+        return +1
+    elif det < 0:
+        return -1
+    else:
+        return 0
+
+def _intersectRobust(x1, y1, x2, y2, x3, y3, x4, y4):
+    """
+    Intersect as done by intersect, deciding whether the edges meet with
+    exact orientation tests. Only the point itself is computed in
+    floating point, and kept within the first edge.
+    """
+    side1 = orient2d(x3, y3, x4, y4, x1, y1)
+    side2 = orient2d(x3, y3, x4, y4, x2, y2)
+    if side1 == side2:
+        return None    # PARALLEL, COINCIDENT OR ON ONE SIDE
+    if orient2d(x1, y1, x2, y2, x3, y3) * orient2d(x1, y1, x2, y2, x4, y4) > 0:
+        return None
+
+    denom = (y4 - y3)*(x2 - x1) - (x4 - x3)*(y2 - y1)
+    ux = (x4-x3)*(y1-y3) - (y4-y3)*(x1-x3)
+    if denom == 0:
+        # lost to rounding, so compute exactly
+        denom = (Fraction(y4) - y3)*(Fraction(x2) - x1) - (Fraction(x4) - x3)*(Fraction(y2) - y1)
+        ux = (Fraction(x4) - x3)*(Fraction(y1) - y3) - (Fraction(y4) - y3)*(Fraction(x1) - x3)
+    ux = float(min(max(ux / denom, 0), 1))
+    return (x1 + ux*(x2-x1), y1 + ux*(y2-y1))
+
 def intersect(x1, y1, x2, y2, x3, y3, x4, y4):
     """
     Return the point of intersection (or None) between edges:
@@ -41,6 +121,9 @@ def intersect(x1, y1, x2, y2, x3, y3, x4, y4):
 
     Might include end-points.
     """
+    if robust:
+        return _intersectRobust(x1, y1, x2, y2, x3, y3, x4, y4)
+
     # common denominator
     da = (y4 - y3)*(x2 - x1)
     db = (x4 - x3)*(y2 - y1)
@@ -65,3 +148,86 @@ def intersect(x1, y1, x2, y2, x3, y3, x4, y4):
         
     return None     # no intersection
 
+
+def intersectExact(x1, y1, x2, y2, x3, y3, x4, y4):
+    """
+    Return the point of intersection (or None) between edges, as done
+    by intersect, for int (or Fraction) coordinates. No epsilon is
+    needed since everything is computed exactly, and coordinates of the
+    point are returned as Fraction objects. Float coordinates are also
+    accepted, since each converts to a Fraction exactly, though slowly.
+    """
+    if not all(type(c) is int for c in (x1, y1, x2, y2, x3, y3, x4, y4)):
+        x1, y1, x2, y2, x3, y3, x4, y4 = map(Fraction, (x1, y1, x2, y2, x3, y3, x4, y4))
+
+    denom = (y4 - y3)*(x2 - x1) - (x4 - x3)*(y2 - y1)
+    if denom == 0:
+        return None    # PARALLEL OR COINCIDENT
+
+    ux = (x4-x3)*(y1-y3) - (y4-y3)*(x1-x3)
+    uy = (x2-x1)*(y1-y3) - (y2-y1)*(x1-x3)
+    if denom < 0:
+        denom = -denom
+        ux = -ux
+        uy = -uy
+    if 0 <= ux <= denom and 0 <= uy <= denom:
+        ux = Fraction(ux, denom)
+        return (x1 + ux*(x2-x1), y1 + ux*(y2-y1))
+
+    return None     # no intersection
+
+def intersectMany(first, second, chunk=1<<20):
+    """
+    Return intersections between every segment in first and every
+    segment in second, where segments are (x1,y1,x2,y2) tuples. Result
+    is (pairs, points), where pairs is list of (i,j) in increasing order
+    and points[k] is the (x,y) point returned by intersect for pairs[k].
+    At most chunk pairs are computed at one time to bound memory.
+    """
+    if numpy is None or robust or len(first) == 0 or len(second) == 0:
+        pairs = []
+        points = []
+        for i in range(len(first)):
+            s = first[i]
+            for j in range(len(second)):
+                t = second[j]
+                pt = intersect(s[0], s[1], s[2], s[3], t[0], t[1], t[2], t[3])
+                if pt is not None:
+                    pairs.append((i, j))
+                    points.append(pt)
+        return (pairs, points)
+
+    a = numpy.asarray(first, dtype=float).reshape(-1, 4)
+    b = numpy.asarray(second, dtype=float).reshape(-1, 4)
+    x3 = b[:,0]
+    y3 = b[:,1]
+    dx2 = b[:,2] - x3
+    dy2 = b[:,3] - y3
+    rows = max(1, chunk // len(b))
+
+    pairs = []
+    points = []
+    for start in range(0, len(a), rows):
+        block = a[start:start+rows]
+        x1 = block[:,0,None]
+        y1 = block[:,1,None]
+        dx1 = block[:,2,None] - x1
+        dy1 = block[:,3,None] - y1
+
+        # same expressions as intersect, broadcast over block of pairs
+        denom = dy2*dx1 - dx2*dy1
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            ux = (dx2*(y1-y3) - dy2*(x1-x3)) / denom
+            uy = (dx1*(y1-y3) - dy1*(x1-x3)) / denom
+        hit = numpy.abs(denom) > epsilon
+        hit &= (ux >= -epsilon) & (ux - 1 <= epsilon)
+        hit &= (uy >= -epsilon) & (uy - 1 <= epsilon)
+
+        i, j = numpy.nonzero(hit)
+        u = ux[i, j]
+        ix = block[i,0] + u*(block[i,2] - block[i,0])
+        iy = block[i,1] + u*(block[i,3] - block[i,1])
+        pairs.extend(zip((i + start).tolist(), j.tolist()))
+        points.extend(zip(ix.tolist(), iy.tolist()))
+
+    return (pairs, points)
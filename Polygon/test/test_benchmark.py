@@ -0,0 +1,22 @@
+import unittest
+
+from bench.benchmark import run, compare
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_smallRun(self):
+        report = run(seed=1, maxPoints=100, maxVertices=10, repeat=1)
+        names = set(r['benchmark'] for r in report['results'])
+        self.assertEqual({'computeHull', 'convexIntersect', 'Polygon.intersect',
+                          'Polygon.simple', 'Polygon.convex'}, names)
+        for r in report['results']:
+            self.assertGreater(r['seconds'], 0)
+            self.assertGreater(r['peakBytes'], 0)
+
+        # same report is never slower than itself
+        self.assertEqual([], compare(report, report, 1.0))
+
+    def test_only(self):
+        report = run(maxPoints=10, maxVertices=3, repeat=1, only=['Polygon.convex'])
+        self.assertEqual(['Polygon.convex'],
+                         [r['benchmark'] for r in report['results']])
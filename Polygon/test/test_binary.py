@@ -0,0 +1,64 @@
+import unittest
+
+from poly.point import Point
+from poly.polygon import Polygon
+from poly.packed import PackedPolygon
+from poly.binary import writePolygons, PolygonFile
+from poly.convex_intersect import convexIntersect
+from hull.convex import computeHull, computeRandom
+
+import os
+import random
+import tempfile
+
+class TestBinary(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.poly')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_roundTrip(self):
+        random.seed(12)
+        polygons = [computeRandom(0, 0, 100, 100) for i in range(50)]
+        polygons.append(Polygon())
+        polygons.append(PackedPolygon([Point(1.5, 2), Point(3, 4)]))
+        writePolygons(self.path, polygons)
+
+        with PolygonFile(self.path) as f:
+            self.assertEqual(len(polygons), len(f))
+            for p, q in zip(polygons, f):
+                self.assertEqual(p, q)
+            self.assertEqual(polygons[-1], f[-1])
+
+            # views work with the algorithms, but are read-only
+            self.assertEqual(convexIntersect(PackedPolygon(polygons[0]), PackedPolygon(polygons[1])),
+                             convexIntersect(f[0], f[1]))
+            self.assertEqual(computeHull(list(polygons[2])), computeHull(f[2]))
+            with self.assertRaises(TypeError):
+                f[0].get(0).set(1, 1)
+            copy = f[0].copy()
+            copy.get(0).set(1, 1)
+            with self.assertRaises(IndexError):
+                f[len(polygons)]
+
+    def test_notPolygonFile(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'something else entirely')
+        with self.assertRaises(ValueError):
+            PolygonFile(self.path)
+
+    def test_truncated(self):
+        writePolygons(self.path, [computeHull([Point(0, 0), Point(4, 0), Point(0, 4)])])
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 8)
+        with self.assertRaises(ValueError):
+            PolygonFile(self.path)
+
+        # cut within a coordinate
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+        with self.assertRaises(ValueError):
+            PolygonFile(self.path)
@@ -0,0 +1,109 @@
+import unittest
+
+from poly.point import Point
+from poly.polygon import Polygon
+from poly.clip import clip, intersection, union, difference, xor, OPERATIONS
+
+import math
+import random
+
+def square(x, y, size):
+    """Counter-clockwise square with lower left corner (x,y)."""
+    return Polygon([Point(x, y), Point(x + size, y),
+                    Point(x + size, y + size), Point(x, y + size)])
+
+def star(cx, cy, r, n):
+    """Random star-shaped polygon with integer coordinates, or None."""
+    pts = []
+    for a in sorted(random.uniform(0, 2*math.pi) for i in range(n)):
+        d = random.uniform(r/4, r)
+        pt = (round(cx + d*math.cos(a)), round(cy + d*math.sin(a)))
+        if pt not in pts:
+            pts.append(pt)
+    p = Polygon([Point(x, y) for (x, y) in pts])
+    if not p.valid() or not p.simple():
+        return None
+    return p
+
+def area(rings):
+    """Total signed area of rings, with holes clockwise."""
+    total = 0
+    for ring in rings:
+        pts = [(pt.x(), pt.y()) for pt in ring]
+        for i in range(len(pts)):
+            total += (pts[i-1][0]*pts[i][1] - pts[i][0]*pts[i-1][1]) / 2
+    return total
+
+def inside(rings, x, y):
+    """Determine if (x,y) is inside an odd number of rings."""
+    return sum(1 for ring in rings if ring.locate(x, y) > 0) % 2 == 1
+
+class TestClip(unittest.TestCase):
+
+    def test_squares(self):
+        a = square(0, 0, 4)
+        b = square(2, 2, 4)
+        self.assertEqual([square(2, 2, 2)], intersection(a, b))
+        self.assertEqual(28, area(union(a, b)))
+        self.assertEqual(1, len(union(a, b)))
+        self.assertEqual(12, area(difference(a, b)))
+        self.assertEqual(24, area(xor(a, b)))
+        self.assertEqual(2, len(xor(a, b)))
+
+    def test_hole(self):
+        """Result with a hole, which can be passed back in."""
+        rings = difference(square(0, 0, 10), square(3, 3, 3))
+        self.assertEqual(2, len(rings))
+        self.assertEqual(91, area(rings))
+        self.assertTrue(inside(rings, 1, 1))
+        self.assertFalse(inside(rings, 4, 4))
+
+        rings = union(rings, square(4, 4, 1))
+        self.assertEqual(3, len(rings))
+        self.assertEqual(92, area(rings))
+        self.assertTrue(inside(rings, 4.5, 4.5))
+
+    def test_sharedEdges(self):
+        a = square(0, 0, 10)
+        self.assertEqual([a], intersection(a, a))
+        self.assertEqual([a], union(a, a))
+        self.assertEqual([], xor(a, a))
+        self.assertEqual([], intersection(a, square(10, 0, 10)))
+        self.assertEqual([Polygon([Point(0, 0), Point(20, 0), Point(20, 10), Point(0, 10)])],
+                         union(a, square(10, 0, 10)))
+
+        # squares touching at a corner stay separate rings
+        self.assertEqual([a, square(10, 10, 10)], union(a, square(10, 10, 10)))
+
+    def test_clockwise(self):
+        a = Polygon(list(reversed(square(0, 0, 4).points)))
+        self.assertEqual(4, area(intersection(a, square(2, 2, 4))))
+
+    def test_unknownOperation(self):
+        with self.assertRaises(ValueError):
+            clip(square(0, 0, 1), square(0, 0, 1), 'sum')
+
+    def test_randomAgainstLocate(self):
+        """Concave polygons: sampled points and areas must agree."""
+        random.seed(14)
+        for trial in range(100):
+            p = star(10, 10, 10, random.randint(3, 15))
+            q = star(random.randint(5, 15), random.randint(5, 15), 10, random.randint(3, 15))
+            if p is None or q is None:
+                continue
+            results = {}
+            for name, operation in OPERATIONS.items():
+                rings = results[name] = clip(p, q, name)
+                for ring in rings:
+                    self.assertTrue(ring.simple())
+                for i in range(50):
+                    x = random.uniform(0, 20) + 1E-7
+                    y = random.uniform(0, 20) + 1E-7
+                    self.assertEqual(operation(p.locate(x, y) > 0, q.locate(x, y) > 0),
+                                     inside(rings, x, y))
+
+            both = area(results['intersection'])
+            self.assertAlmostEqual(abs(area([p])) + abs(area([q])) - both,
+                                   area(results['union']))
+            self.assertAlmostEqual(abs(area([p])) - both, area(results['difference']))
+            self.assertAlmostEqual(area(results['union']) - both, area(results['xor']))
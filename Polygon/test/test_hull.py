@@ -0,0 +1,250 @@
+import unittest
+
+from poly.point import Point
+from poly.polygon import Polygon
+from hull.convex import computeHull, computeHullChan, computeHullArray, computeHullParallel, _prefilter
+from hull.incremental import IncrementalHull
+from hull.stream import computeHullStream
+from hull.calipers import antipodalPairs, diameter, width, minAreaRectangle, minPerimeterRectangle
+
+import hull.convex
+import poly.util
+import io
+import math
+
+import random
+
+def randomPoints(n, g):
+    """Random points with integer coordinates from grid of size g."""
+    return [Point(random.randint(0, g), random.randint(0, g)) for i in range(n)]
+
+class TestHull(unittest.TestCase):
+
+    def test_incrementalMatchesComputeHull(self):
+        random.seed(2)
+        for trial in range(200):
+            points = randomPoints(random.randint(3, 60), random.choice([3, 10, 1000]))
+            hull = IncrementalHull()
+            for i, pt in enumerate(points):
+                hull.add(pt)
+                if len(set((p.x(), p.y()) for p in points[:i+1])) >= 3:
+                    expected = computeHull(points[:i+1])
+                    self.assertEqual(expected, hull.hull())
+                    self.assertEqual(expected.numPoints(), hull.numPoints())
+
+    def test_incrementalNearlyCollinear(self):
+        """Float points where epsilon decides many turns still match."""
+        random.seed(3)
+        for trial in range(10):
+            slope = random.uniform(-1, 1)
+            points = [Point(x, slope*x + random.uniform(-1E-9, 1E-9))
+                      for x in (random.random() for i in range(200))]
+            hull = IncrementalHull(points)
+            self.assertEqual(computeHull(points), hull.hull())
+            self.assertEqual(computeHull(points).numPoints(), hull.numPoints())
+
+            angles = [random.uniform(0, 2*math.pi) for i in range(1000)]
+            points = [Point(math.cos(a), math.sin(a)) for a in angles]
+            self.assertEqual(computeHull(points), IncrementalHull(points).hull())
+
+    def test_interiorPointRejected(self):
+        hull = IncrementalHull([Point(0, 0), Point(10, 0), Point(10, 10), Point(0, 10)])
+        polygon = hull.hull()
+        self.assertFalse(hull.add(Point(5, 5)))
+        self.assertFalse(hull.add(Point(10, 5)))
+        self.assertFalse(hull.add(Point(0, 0)))
+        self.assertIs(polygon, hull.hull())
+        self.assertEqual(7, hull.count)
+
+        self.assertTrue(hull.add(Point(5, -5)))
+        self.assertEqual(5, hull.numPoints())
+        self.assertTrue(hull.hull().convex())
+
+    def test_contains(self):
+        hull = IncrementalHull([Point(0, 0), Point(10, 0), Point(5, 10)])
+        self.assertTrue(hull.contains(Point(5, 5)))
+        self.assertTrue(hull.contains(Point(5, 0)))
+        self.assertTrue(hull.contains(Point(5, 10)))
+        self.assertFalse(hull.contains(Point(5, 11)))
+        self.assertFalse(hull.contains(Point(-1, 0)))
+
+    def test_fewPoints(self):
+        hull = IncrementalHull()
+        self.assertEqual(0, hull.numPoints())
+        hull.add(Point(3, 4))
+        self.assertEqual([Point(3, 4)], list(hull))
+        hull.add(Point(1, 1))
+        hull.add(Point(2, 2.5))
+        self.assertEqual(computeHull([Point(3, 4), Point(1, 1), Point(2, 2.5)]),
+                         hull.hull())
+
+    def test_chanMatchesComputeHull(self):
+        random.seed(5)
+        for trial in range(300):
+            points = randomPoints(random.randint(1, 300), random.choice([1, 3, 10, 1000]))
+            self.assertEqual(computeHull(points), computeHullChan(points))
+
+    def test_chanLargeInput(self):
+        random.seed(6)
+        points = [Point(random.random(), random.random()) for i in range(5000)]
+        points += [Point(0, 0), Point(1, 0), Point(1, 1), Point(0, 1)]
+        self.assertEqual(computeHull(points), computeHullChan(points))
+
+    def test_chanNearlyCollinear(self):
+        """Float points where epsilon decides many turns still match."""
+        random.seed(14)
+        for trial in range(20):
+            angles = [random.uniform(0, 2*math.pi) for i in range(300)]
+            points = [Point(math.cos(a), math.sin(a)) for a in angles]
+            points += [Point(random.uniform(-.5, .5), random.uniform(-.5, .5)) for i in range(300)]
+            self.assertEqual(computeHull(points), computeHullChan(points))
+
+            slope = random.uniform(-1, 1)
+            points = [Point(x, slope*x + random.uniform(-1E-9, 1E-9))
+                      for x in (random.random() for i in range(300))]
+            self.assertEqual(computeHull(points), computeHullChan(points))
+
+    def test_prefilterKeepsHull(self):
+        random.seed(7)
+        points = randomPoints(2000, 100)
+        kept = set(_prefilter([(pt.x(), pt.y()) for pt in points]))
+        self.assertLess(len(kept), len(points))
+        for pt in computeHull(points):
+            self.assertIn((pt.x(), pt.y()), kept)
+
+    def test_streamMatchesComputeHull(self):
+        random.seed(8)
+        for trial in range(200):
+            points = randomPoints(random.randint(0, 200), random.choice([1, 3, 10, 1000]))
+            chunk = random.choice([3, 7, 50])
+            self.assertEqual(computeHull(points), computeHullStream(iter(points), chunk))
+
+    def test_streamNearlyCollinear(self):
+        """Float points where epsilon decides many turns still match."""
+        random.seed(13)
+        for trial in range(5):
+            angles = [random.uniform(0, 2*math.pi) for i in range(2000)]
+            points = [Point(math.cos(a), math.sin(a)) for a in angles]
+            self.assertEqual(computeHull(points), computeHullStream(iter(points), 100))
+
+            slope = random.uniform(-1, 1)
+            points = [Point(x, slope*x + random.uniform(-1E-9, 1E-9))
+                      for x in (random.random() for i in range(400))]
+            self.assertEqual(computeHull(points), computeHullStream(iter(points), 50))
+
+    def test_streamFromFile(self):
+        text = "# square\n0 0\n4,0\n\n4 4\n0 4\n2 2\n"
+        hull = computeHullStream(io.StringIO(text), 3)
+        self.assertEqual(Polygon([Point(0, 0), Point(4, 0), Point(4, 4), Point(0, 4)]), hull)
+
+    def test_arrayMatchesComputeHull(self):
+        random.seed(9)
+        for trial in range(200):
+            points = randomPoints(random.randint(0, 200), random.choice([1, 3, 10, 1000]))
+            coords = [(pt.x(), pt.y()) for pt in points]
+            expected = computeHull(points)
+            indices, polygon = computeHullArray(coords)
+            self.assertEqual(expected, polygon)
+            self.assertEqual(expected, Polygon([points[i] for i in indices]))
+
+            saved = hull.convex.numpy
+            hull.convex.numpy = None
+            try:
+                indices, polygon = computeHullArray(coords)
+            finally:
+                hull.convex.numpy = saved
+            self.assertEqual(expected, polygon)
+            self.assertEqual(expected, Polygon([points[i] for i in indices]))
+
+    def test_parallelMatchesComputeHull(self):
+        random.seed(10)
+        points = randomPoints(3000, 1000)
+        self.assertEqual(computeHull(points), computeHullParallel(points, 3))
+
+    def test_parallelNearlyCollinear(self):
+        """Float points where epsilon decides many turns still match."""
+        random.seed(12)
+        for trial in range(10):
+            angles = [random.uniform(0, 2*math.pi) for i in range(400)]
+            points = [Point(math.cos(a), math.sin(a)) for a in angles]
+            self.assertEqual(computeHull(points), computeHullParallel(points, 3))
+
+            slope = random.uniform(-1, 1)
+            points = [Point(x, slope*x + random.uniform(-1E-9, 1E-9))
+                      for x in (random.random() for i in range(400))]
+            self.assertEqual(computeHull(points), computeHullParallel(points, 3))
+        for trial in range(50):
+            points = randomPoints(random.randint(0, 30), random.choice([1, 3, 10]))
+            self.assertEqual(computeHull(points), computeHullParallel(points, 1))
+
+    def test_robustHull(self):
+        """Tiny coordinates, where epsilon would find no turns at all."""
+        random.seed(11)
+        points = [Point(random.uniform(-1E-6, 1E-6), random.uniform(-1E-6, 1E-6))
+                  for i in range(200)]
+        saved = poly.util.robust
+        poly.util.robust = True
+        try:
+            hull = computeHull(points)
+            self.assertEqual(hull, computeHullChan(points))
+            self.assertEqual(hull, computeHullArray([(pt.x(), pt.y()) for pt in points])[1])
+            self.assertEqual(hull, computeHullParallel(points, 3))
+            self.assertTrue(hull.convex())
+            for pt in points:
+                self.assertGreaterEqual(hull.locate(pt.x(), pt.y()), 0)
+        finally:
+            poly.util.robust = saved
+        self.assertLess(computeHull(points).numPoints(), hull.numPoints())
+
+    def test_integerHull(self):
+        random.seed(12)
+        for trial in range(100):
+            points = randomPoints(random.randint(3, 100), random.choice([3, 10, 1000]))
+            hull = computeHull(points)
+            self.assertEqual(computeHull([Point(float(pt.x()), float(pt.y())) for pt in points]), hull)
+            for pt in hull:
+                self.assertIs(int, type(pt.x()))
+
+    def test_calipersMatchBruteForce(self):
+        random.seed(13)
+        for trial in range(200):
+            hull = computeHull(randomPoints(random.randint(3, 60), random.choice([5, 50, 1000])))
+            if not hull.valid():
+                continue
+            pts = [(pt.x(), pt.y()) for pt in hull]
+            n = len(pts)
+            d = max(math.hypot(a[0] - b[0], a[1] - b[1]) for a in pts for b in pts)
+            (found, i, j) = diameter(hull)
+            self.assertAlmostEqual(d, found)
+            self.assertIn((i, j), antipodalPairs(hull))
+            self.assertAlmostEqual(d, math.hypot(pts[i][0] - pts[j][0], pts[i][1] - pts[j][1]))
+
+            w = area = perimeter = None
+            for i in range(n):
+                (x0, y0), (x1, y1) = pts[i], pts[(i+1) % n]
+                length = math.hypot(x1 - x0, y1 - y0)
+                along = [((x1 - x0)*(x - x0) + (y1 - y0)*(y - y0)) / length for (x, y) in pts]
+                high = max(((x1 - x0)*(y - y0) - (y1 - y0)*(x - x0)) / length for (x, y) in pts)
+                span = max(along) - min(along)
+                w = high if w is None else min(w, high)
+                area = span*high if area is None else min(area, span*high)
+                perimeter = 2*(span + high) if perimeter is None else min(perimeter, 2*(span + high))
+            self.assertAlmostEqual(w, width(hull)[0])
+            self.assertAlmostEqual(area, minAreaRectangle(hull)[0])
+            self.assertAlmostEqual(perimeter, minPerimeterRectangle(hull)[0])
+
+            rect = minAreaRectangle(hull)[1]
+            a, b, c = rect.get(0), rect.get(1), rect.get(2)
+            self.assertAlmostEqual(area, math.hypot(b.x() - a.x(), b.y() - a.y()) *
+                                         math.hypot(c.x() - b.x(), c.y() - b.y()))
+
+    def test_calipersSquare(self):
+        square = computeHull([Point(0, 0), Point(4, 0), Point(4, 2), Point(0, 2), Point(1, 1)])
+        self.assertEqual([(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)], antipodalPairs(square))
+        self.assertEqual((math.sqrt(20), 0, 2), diameter(square))
+        self.assertEqual((2.0, 0, 2), width(square))
+        area, rect, support = minAreaRectangle(square)
+        self.assertEqual(8.0, area)
+        self.assertEqual(square, rect)
+        self.assertIsNone(width(computeHull([Point(0, 0), Point(1, 1)])))
+        self.assertEqual([(0, 1)], antipodalPairs(computeHull([Point(0, 0), Point(1, 1)])))
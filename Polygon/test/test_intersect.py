@@ -3,8 +3,17 @@ import unittest
 from poly.edge import Edge
 from poly.point import Point
 from poly.polygon import Polygon
-from poly.convex_intersect import convexIntersect
-from util import samePolygon
+from poly.convex_intersect import convexIntersect, containedWithin
+from poly.convex_intersect import containedWithinMany, convexIntersectMany
+from poly.convex_intersect import separatingEdge, convexOverlap, convexOverlapLog
+from poly.convex_intersect import ConvexIntersector
+from poly.convex_intersect import minkowskiSum, minkowskiDifference, penetration
+from poly.packed import PackedPolygon
+from poly.convex_intersect import pack, _polygon, _intersectPacked
+import poly.convex_intersect
+import poly.util
+from hull.convex import computeHull, computeRandom
+from util import samePolygon, samePoint
 import random
 
 class TestIntersect(unittest.TestCase):
@@ -85,6 +94,28 @@ class TestIntersect(unittest.TestCase):
         self.assertEqual(p, q)
         self.assertIsNone(p)
 
+    def test_touching(self):
+        """Polygons that only touch at a corner or along an edge don't intersect."""
+        square = Polygon([
+                Point(0, 0),
+                Point(2, 0),
+                Point(2, 2),
+                Point(0, 2)])
+        corner = Polygon([
+                Point(2, -2),
+                Point(4, -2),
+                Point(4, 0),
+                Point(2, 0)])
+        edge = Polygon([
+                Point(2, 0),
+                Point(4, 0),
+                Point(4, 2),
+                Point(2, 2)])
+
+        for other in (corner, edge):
+            self.assertIsNone(convexIntersect(square, other))
+            self.assertIsNone(convexIntersect(other, square))
+
     def test_enclosing(self):
         """Detect when polygon wholly contains another polygon."""
         square = Polygon([
@@ -135,3 +166,267 @@ class TestIntersect(unittest.TestCase):
         i2 = convexIntersect(q,p)
         self.assertTrue(samePolygon(i1, i2))
 
+    def test_convexIntersectMany(self):
+        random.seed(9)
+        pairs = [(computeRandom(0, 0, 300, 300), computeRandom(100, 100, 400, 400))
+                 for i in range(40)]
+        expected = [convexIntersect(p, q) for (p, q) in pairs]
+
+        found = list(convexIntersectMany(pairs, workers=2, chunksize=8))
+        self.assertEqual(len(expected), len(found))
+        for e, f in zip(expected, found):
+            if e is None:
+                self.assertIsNone(f)
+            else:
+                self.assertTrue(samePolygon(e, f))
+
+        unordered = dict(convexIntersectMany(pairs, workers=2, ordered=False))
+        self.assertEqual(set(range(len(pairs))), set(unordered))
+        for i in unordered:
+            self.assertEqual(found[i], unordered[i])
+
+        inline = list(convexIntersectMany(pairs, workers=1))
+        self.assertEqual(expected, inline)
+
+        # a single worker gives the same kind of result, never p or q
+        p, q = pairs[0]
+        inner = Polygon([Point(150, 150), Point(160, 150), Point(150, 160)])
+        for workers in (1, 2):
+            few = list(convexIntersectMany([(p, q), (q, inner)], workers=workers))
+            self.assertIs(Polygon, type(few[0]))
+            self.assertIsNot(inner, few[1])
+            self.assertEqual(inner, few[1])
+            self.assertIs(float, type(few[1].get(0).x()))
+
+    def test_convexIntersectManyRobust(self):
+        """Workers follow poly.util.robust as set by the caller."""
+        random.seed(15)
+        pairs = []
+        for i in range(40):
+            p = computeHull([Point(random.uniform(0, 3E-5), random.uniform(0, 3E-5)) for j in range(8)])
+            q = computeHull([Point(random.uniform(1E-5, 4E-5), random.uniform(1E-5, 4E-5)) for j in range(8)])
+            pairs.append((p, q))
+        tasks = [(i, pack(p), pack(q), False, True) for i, (p, q) in enumerate(pairs)]
+
+        saved = poly.util.robust
+        try:
+            poly.util.robust = True
+            expected = list(convexIntersectMany(pairs, workers=1))
+            self.assertEqual(expected, list(convexIntersectMany(pairs, workers=2, chunksize=4)))
+
+            # as in a fresh worker process, which has not seen the flag
+            poly.util.robust = False
+            found = [_polygon(_intersectPacked(task)[1]) for task in tasks]
+        finally:
+            poly.util.robust = saved
+        self.assertEqual(expected, found)
+        self.assertNotEqual(expected, list(convexIntersectMany(pairs, workers=1)))
+
+    def test_convexIntersectManyLazy(self):
+        """Pairs are read a batch at a time, not all at once."""
+        random.seed(13)
+        read = []
+        def pairs():
+            for i in range(1000):
+                read.append(i)
+                yield (computeRandom(0, 0, 30, 30), computeRandom(10, 10, 40, 40))
+        results = convexIntersectMany(pairs(), workers=2, chunksize=4)
+        next(results)
+        self.assertLessEqual(len(read), 2 * 2*4*2 + 1)
+        self.assertEqual(999, sum(1 for r in results))
+
+    def test_containedWithin(self):
+        square = Polygon([
+                Point(-2, -2),
+                Point(2, -2),
+                Point(2, 2),
+                Point(-2, 2)])
+        self.assertTrue(containedWithin(Point(0, 0), square))
+        self.assertTrue(containedWithin(Point(1, -1.5), square))
+        self.assertTrue(containedWithin(Point(2, 0), square))
+        self.assertTrue(containedWithin(Point(-2, 2), square))
+        self.assertTrue(containedWithin(Point(-2, -2), square))
+        self.assertFalse(containedWithin(Point(3, 0), square))
+        self.assertFalse(containedWithin(Point(-3, -3), square))
+        self.assertFalse(containedWithin(Point(0, 2.5), square))
+
+    def test_containedWithinMany(self):
+        """Batch version must agree with locate."""
+        random.seed(5)
+        hull = computeHull([Point(random.randint(0, 100), random.randint(0, 100))
+                            for i in range(200)])
+        pts = [Point(random.randint(-10, 110), random.randint(-10, 110))
+               for i in range(500)]
+        pts.extend(hull)
+        expected = [hull.locate(pt.x(), pt.y()) >= 0 for pt in pts]
+        self.assertEqual(expected, [containedWithin(pt, hull) for pt in pts])
+        self.assertEqual(expected, containedWithinMany(pts, hull))
+
+        saved = poly.convex_intersect.numpy
+        poly.convex_intersect.numpy = None
+        try:
+            self.assertEqual(expected, containedWithinMany(pts, hull))
+        finally:
+            poly.convex_intersect.numpy = saved
+
+    def test_separatingEdge(self):
+        square = Polygon([Point(0, 0), Point(4, 0), Point(4, 4), Point(0, 4)])
+        right = Polygon([Point(6, 1), Point(8, 1), Point(7, 3)])
+        self.assertEqual((0, 1), separatingEdge(square, right))
+        self.assertEqual((0, 1), separatingEdge(square, right, (0, 1)))
+        self.assertEqual((0, 1), separatingEdge(square, right, (1, 0)))
+        self.assertFalse(convexOverlap(square, right))
+
+        # touching counts as overlap
+        touch = Polygon([Point(4, 1), Point(8, 1), Point(7, 3)])
+        self.assertIsNone(separatingEdge(square, touch))
+        self.assertTrue(convexOverlapLog(square, touch))
+
+    def test_convexOverlap(self):
+        """Both tests agree, and report overlap when convexIntersect does."""
+        random.seed(8)
+        for trial in range(300):
+            p = computeRandom(0, 0, 10, 10)
+            q = computeRandom(random.randint(0, 12), random.randint(0, 12), 20, 20)
+            if p.numPoints() < 3 or q.numPoints() < 3:
+                continue
+            expected = separatingEdge(p, q) is None
+            self.assertEqual(expected, convexOverlap(p, q))
+            self.assertEqual(expected, convexOverlapLog(p, q))
+            self.assertEqual(expected, convexOverlapLog(q, p))
+            if convexIntersect(p, q) is not None:
+                self.assertTrue(expected)
+
+    def test_convexOverlapLogParallel(self):
+        """Parallel edges leave collinear vertices in the difference."""
+        p = Polygon([Point(-7, 3), Point(2, -7), Point(8, -5), Point(9, 2),
+                     Point(6, 4), Point(-5, 10), Point(-7, 10)])
+        q = Polygon([Point(-17, 22), Point(-16, 15), Point(-11, 15), Point(-7, 19),
+                     Point(-7, 25), Point(-16, 25)])
+        self.assertFalse(convexOverlapLog(p, q))
+        self.assertFalse(convexOverlapLog(q, p))
+
+        random.seed(12)
+        for trial in range(1500):
+            g = random.choice([5, 10, 20, 100])
+            k = random.choice([3, 5, 10, 50])
+            p = computeHull([Point(random.randint(-g, g), random.randint(-g, g))
+                             for i in range(k)])
+            dx = random.randint(-3*g, 3*g)
+            dy = random.randint(-3*g, 3*g)
+            q = computeHull([Point(dx + random.randint(-g, g), dy + random.randint(-g, g))
+                             for i in range(k)])
+            if not p.valid() or not q.valid():
+                continue
+            expected = minkowskiDifference(p, q).locate(0, 0) >= 0
+            self.assertEqual(expected, separatingEdge(p, q) is None)
+            self.assertEqual(expected, convexOverlapLog(p, q))
+            self.assertEqual(expected, convexOverlapLog(q, p))
+
+    def test_integerIntersect(self):
+        """Int coordinates are intersected exactly, then rounded."""
+        random.seed(10)
+        for trial in range(200):
+            p = computeRandom(0, 0, 100, 100)
+            q = computeRandom(20, 20, 120, 120)
+            if p.numPoints() < 3 or q.numPoints() < 3:
+                continue
+            result = convexIntersect(p, q)
+            expected = convexIntersect(PackedPolygon(p), PackedPolygon(q))
+            if result is None:
+                self.assertIsNone(expected)
+                continue
+            self.assertEqual(expected.numPoints(), result.numPoints())
+            for pt in result:
+                self.assertTrue(any(samePoint(pt, e) for e in expected))
+                self.assertIn(type(pt.x()), (int, float))
+                self.assertIn(type(pt.y()), (int, float))
+
+        square = Polygon([Point(0, 0), Point(3, 0), Point(3, 3), Point(0, 3)])
+        triangle = Polygon([Point(1, -1), Point(2, -1), Point(2, 1)])
+        self.assertEqual(Polygon([Point(2, 0), Point(2, 1), Point(1.5, 0)]),
+                         convexIntersect(square, triangle))
+
+    def test_integerIntersectConsistent(self):
+        """Int pairs give the same values with any number of workers."""
+        random.seed(14)
+        pairs = [(computeRandom(0, 0, 100, 100), computeRandom(20, 20, 120, 120))
+                 for i in range(40)]
+        inline = list(convexIntersectMany(pairs, workers=1))
+        pooled = list(convexIntersectMany(pairs, workers=2, chunksize=4))
+        self.assertEqual(inline, pooled)
+
+        intersector = ConvexIntersector()
+        p, q = pairs[0]
+        self.assertEqual(inline[0], intersector.intersect(p, q))
+        self.assertTrue(intersector._exact)
+        intersector.reset()
+        p = Polygon([Point(x + 0.5, y) for (x, y) in [(0, 0), (100, 0), (100, 100)]])
+        intersector.intersect(p, q)
+        self.assertFalse(intersector._exact)
+
+        # moving off int coordinates after the decision is still exact
+        intersector.reset()
+        p, q = pairs[0]
+        intersector.intersect(p, q)
+        p.translate(0.5, 0.25)
+        self.assertTrue(samePolygon(convexIntersect(p, q), intersector.intersect(p, q)))
+
+    def test_convexIntersector(self):
+        """Warm-started intersection matches convexIntersect as p moves."""
+        random.seed(9)
+        for trial in range(20):
+            p = computeRandom(0, 0, 100, 100)
+            q = computeRandom(50, 50, 150, 150)
+            if p.numPoints() < 3 or q.numPoints() < 3:
+                continue
+            intersector = ConvexIntersector()
+            for frame in range(50):
+                dx = random.uniform(-3, 3)
+                dy = random.uniform(-3, 3)
+                for pt in p:
+                    pt.set(pt.x() + dx, pt.y() + dy)
+                expected = convexIntersect(p, q)
+                result = intersector.intersect(p, q)
+                if expected is None:
+                    self.assertIsNone(result)
+                else:
+                    self.assertTrue(samePolygon(expected, result))
+
+    def test_minkowskiSum(self):
+        """Sum matches hull of all sums of pairs of points."""
+        random.seed(10)
+        for trial in range(200):
+            g = random.choice([3, 10, 100])
+            p = computeHull([Point(random.randint(0, g), random.randint(0, g))
+                             for i in range(random.randint(1, 20))])
+            q = computeHull([Point(random.randint(-g, 0), random.randint(0, g))
+                             for i in range(random.randint(1, 20))])
+            self.assertEqual(computeHull([Point(a.x() + b.x(), a.y() + b.y()) for a in p for b in q]),
+                             minkowskiSum(p, q))
+            self.assertEqual(computeHull([Point(a.x() - b.x(), a.y() - b.y()) for a in p for b in q]),
+                             minkowskiDifference(p, q))
+
+    def test_penetration(self):
+        square = Polygon([Point(0, 0), Point(4, 0), Point(4, 4), Point(0, 4)])
+        triangle = Polygon([Point(3, 1), Point(6, 1), Point(6, 3)])
+        self.assertEqual((1.0, 1.0, 0.0), penetration(square, triangle))
+        triangle.translate(2, 0)
+        self.assertEqual((-1.0, -1.0, 0.0), penetration(square, triangle))
+        self.assertIsNone(penetration(square, Polygon()))
+
+        random.seed(11)
+        for trial in range(50):
+            p = computeRandom(0, 0, 100, 100)
+            q = computeRandom(50, 50, 150, 150)
+            if p.numPoints() < 3 or q.numPoints() < 3:
+                continue
+            (depth, dx, dy) = penetration(p, q)
+            self.assertEqual(depth >= 0, convexOverlap(p, q))
+            if depth > 0:
+                q.translate(1.01*dx, 1.01*dy)
+                self.assertFalse(convexOverlap(p, q))
+            else:
+                q.translate(dx, dy)
+                self.assertAlmostEqual(0, penetration(p, q)[0])
+
@@ -0,0 +1,68 @@
+import unittest
+
+from poly.point import Point
+from poly.polygon import Polygon
+from poly.packed import PackedPolygon
+from poly.convex_intersect import convexIntersect
+from hull.convex import computeHull
+from util import samePolygon
+
+import random
+
+class TestPacked(unittest.TestCase):
+
+    def setUp(self):
+        self.square = Polygon([
+                Point(-2, -2),
+                Point(2, -2),
+                Point(2, 2),
+                Point(-2, 2)])
+        self.triangle = Polygon([
+                Point(-3, 0),
+                Point(3, 0),
+                Point(0, 3)])
+
+    def test_convert(self):
+        p = PackedPolygon(self.square)
+        self.assertEqual(4, p.numPoints())
+        self.assertEqual(Point(2, -2), p.get(1))
+        self.assertEqual(Point(-2, 2), p.get(-1))
+        self.assertEqual(self.square, Polygon(p))
+        self.assertEqual(p, self.square)
+        self.assertEqual(list(self.square.segments()), p.segments())
+        self.assertEqual(self.square.bounds(), p.bounds())
+
+    def test_modify(self):
+        p = PackedPolygon()
+        p.add(0, 0)
+        p.add(4, 0)
+        p.add(9, 9)
+        p.add(0, 4)
+        p.remove(2)
+        self.assertEqual([(0, 0), (4, 0), (0, 4)],
+                         [(pt.x(), pt.y()) for pt in p])
+        p.get(1).set(5, 0)
+        self.assertEqual(5, p.coords()[2])
+        self.assertTrue(p.convex())
+
+    def test_edges(self):
+        p = PackedPolygon(self.square)
+        edges = p.edges()
+        self.assertEqual(4, len(edges))
+        self.assertIs(edges[0], edges[-1].next())
+        self.assertEqual(Point(2, -2), edges[0].tail())
+
+    def test_convexIntersect(self):
+        p = PackedPolygon(self.square)
+        q = PackedPolygon(self.triangle)
+        self.assertTrue(samePolygon(convexIntersect(self.square, self.triangle),
+                                    convexIntersect(p, q)))
+        self.assertTrue(samePolygon(convexIntersect(self.square, self.triangle),
+                                    convexIntersect(p, self.triangle)))
+
+    def test_computeHull(self):
+        random.seed(3)
+        points = [Point(random.randint(0, 50), random.randint(0, 50))
+                  for i in range(100)]
+        self.assertTrue(samePolygon(computeHull(points),
+                                    computeHull(PackedPolygon(points))))
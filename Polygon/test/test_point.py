@@ -0,0 +1,43 @@
+import unittest
+
+from poly.point import Point, FrozenPoint
+
+class TestPoint(unittest.TestCase):
+
+    def test_noDictionary(self):
+        p = Point(2, 3)
+        self.assertFalse(hasattr(p, '__dict__'))
+        with self.assertRaises(AttributeError):
+            p.z = 4
+
+    def test_equality(self):
+        self.assertEqual(Point(2, 3), Point(2.0, 3.0))
+        self.assertNotEqual(Point(2, 3), Point(3, 2))
+        self.assertEqual(Point(2, 3), FrozenPoint(2, 3))
+        self.assertEqual(FrozenPoint(2, 3), Point(2, 3))
+        self.assertNotEqual(Point(2, 3), (2, 3))
+
+    def test_mutablePointNotHashable(self):
+        with self.assertRaises(TypeError):
+            hash(Point(2, 3))
+
+    def test_frozen(self):
+        p = Point(2, 3)
+        f = p.frozen()
+        self.assertIs(f, f.frozen())
+        with self.assertRaises(AttributeError):
+            f.set(4, 5)
+
+        # copies are ordinary points that can be changed
+        c = f.copy()
+        c.set(4, 5)
+        self.assertEqual(Point(4, 5), c)
+        self.assertEqual(Point(2, 3), f)
+
+    def test_deduplicate(self):
+        points = [Point(0, 0), Point(1, 1), Point(0, 0), Point(1.0, 1.0)]
+        unique = set(pt.frozen() for pt in points)
+        self.assertEqual(2, len(unique))
+        self.assertIn(FrozenPoint(1, 1), unique)
+        lookup = {pt.frozen(): i for i, pt in enumerate(points)}
+        self.assertEqual(3, lookup[FrozenPoint(1, 1)])
@@ -3,7 +3,9 @@ import unittest
 from poly.edge import Edge
 from poly.point import Point
 from poly.polygon import Polygon
+from poly.convex_intersect import convexIntersect
 
+import math
 import random
 
 class TestPolygon(unittest.TestCase):
@@ -38,6 +40,105 @@ class TestPolygon(unittest.TestCase):
 
         self.assertFalse(p.intersect(q))
 
+    def test_intersectCrossingEdges(self):
+        p = Polygon([Point(0, 0), Point(4, 0), Point(4, 4), Point(0, 4)])
+        q = Polygon([Point(2, 2), Point(6, 2), Point(6, 6), Point(2, 6)])
+        self.assertTrue(p.intersect(q))
+        self.assertTrue(q.intersect(p))
+
+    def test_intersectContained(self):
+        """Polygon wholly inside another has no crossing edges."""
+        outer = Polygon([Point(0, 0), Point(8, 0), Point(8, 8), Point(0, 8)])
+        inner = Polygon([Point(2, 2), Point(6, 2), Point(4, 6)])
+        self.assertTrue(outer.intersect(inner))
+        self.assertTrue(inner.intersect(outer))
+
+    def test_intersectFarApart(self):
+        p = Polygon([Point(0, 0), Point(4, 0), Point(0, 4)])
+        q = Polygon([Point(10, 10), Point(14, 10), Point(10, 14)])
+        self.assertEqual((0, 0, 4, 4), p.bounds())
+        self.assertFalse(p.intersect(q))
+        self.assertFalse(q.intersect(p))
+
+    def test_edgesCached(self):
+        p = Polygon([Point(0, 0), Point(4, 0), Point(0, 4)])
+        edges = p._edgeRing()
+        self.assertIs(edges, p._edgeRing())
+        self.assertIs(edges[0], edges[-1].next())
+
+        # moving a point is seen by the edges
+        p.get(1).set(6, 0)
+        self.assertEqual(Point(6, 0), p._edgeRing()[0].tail())
+
+        p.add(-2, 2)
+        self.assertIsNot(edges, p._edgeRing())
+        self.assertEqual(4, len(p._edgeRing()))
+        edges = p._edgeRing()
+        p.remove(0)
+        self.assertIsNot(edges, p._edgeRing())
+        self.assertEqual(3, len(p._edgeRing()))
+
+        # edges() hands out a new list of new edges, free to modify
+        mine = p.edges()
+        self.assertEqual(list(p._edgeRing()), mine)
+        self.assertIsNot(p._edgeRing()[0], mine[0])
+        mine[0].setNext(mine[0])
+        mine.pop()
+        self.assertIs(p._edgeRing()[1], p._edgeRing()[0].next())
+        self.assertEqual(3, len(p.edges()))
+
+    def test_locate(self):
+        """Concave polygon shaped like the letter 'U'."""
+        p = Polygon([Point(0, 0), Point(6, 0), Point(6, 6), Point(4, 6),
+                     Point(4, 2), Point(2, 2), Point(2, 6), Point(0, 6)])
+        self.assertEqual(+1, p.locate(1, 5))
+        self.assertEqual(-1, p.locate(3, 5))
+        self.assertEqual(0, p.locate(3, 2))
+        self.assertEqual(0, p.locate(4, 6))
+        self.assertEqual(-1, p.locate(7, 1))
+
+    def test_lazyTranslate(self):
+        p = Polygon([Point(0, 0), Point(4, 0), Point(4, 2)])
+        edges = p._edgeRing()
+        for i in range(100):
+            p.translate(1, 2)
+        self.assertEqual((100, 200, 104, 202), p.bounds())
+        self.assertEqual((104, 200), p.getCoordinates(1))
+
+        # applied once points are needed, to the same points
+        self.assertEqual(Polygon([Point(100, 200), Point(104, 200), Point(104, 202)]), p)
+        self.assertIs(edges, p._edgeRing())
+        self.assertEqual(104, edges[0].tail().x())
+
+    def test_translateCachedEdges(self):
+        """A pending transform is applied when cached edges are used."""
+        p = Polygon([Point(0, 0), Point(4, 0), Point(4, 4), Point(0, 4)])
+        q = Polygon([Point(-102, 1), Point(-99, 1), Point(-99, 3), Point(-102, 3)])
+        p._edgeRing()
+        p.translate(-100, 0)
+        self.assertEqual(-100, p._edgeRing()[0].head().x())
+        self.assertEqual(-1, p.locate(1, 1))
+        self.assertEqual(+1, p.locate(-99, 1))
+        self.assertIsNotNone(convexIntersect(p, q))
+
+        p._edgeRing()
+        p.points = [Point(0, 0), Point(1, 0), Point(0, 1)]
+        self.assertEqual(1, p._edgeRing()[0].tail().x())
+
+    def test_lazyRotateScale(self):
+        p = Polygon([Point(1, 1), Point(3, 1), Point(3, 2)])
+        p.rotate(math.pi/2, 1, 1)
+        p.scale(2)
+        p.translate(0, 1)
+        xs, ys, xs2, ys2 = p.bounds()
+        p.add(10, 10)
+        expected = [(2, 3), (2, 7), (0, 7), (10, 10)]
+        for i, (x, y) in enumerate(expected):
+            self.assertAlmostEqual(x, p.get(i).x())
+            self.assertAlmostEqual(y, p.get(i).y())
+        self.assertAlmostEqual(0, xs)
+        self.assertAlmostEqual(7, ys2)
+
     def test_canIntersectEndPointWithRealIntersection(self):
         e = Edge (Point(0, 0), Point(2, 2))
         f = Edge (Point(-2, 2), Point(2, -2))
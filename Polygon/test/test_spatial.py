@@ -0,0 +1,101 @@
+import unittest
+
+from poly.point import Point
+from poly.polygon import Polygon
+from poly.spatial import GridIndex, overlaps
+
+import random
+
+def randomBox(size):
+    """Random box inside (0,0) - (100,100), no larger than size."""
+    x = random.uniform(0, 100)
+    y = random.uniform(0, 100)
+    return (x, y, x + random.uniform(0, size), y + random.uniform(0, size))
+
+class TestSpatial(unittest.TestCase):
+
+    def test_pairsAgainstBruteForce(self):
+        random.seed(4)
+        boxes = [randomBox(random.choice([1, 5, 30])) for i in range(300)]
+        index = GridIndex()
+        index.load(enumerate(boxes))
+        self.assertEqual(300, len(index))
+
+        expected = set()
+        for i in range(len(boxes)-1):
+            for j in range(i+1, len(boxes)):
+                if overlaps(boxes[i], boxes[j]):
+                    expected.add((i, j))
+        found = [tuple(sorted(pair)) for pair in index.pairs()]
+        self.assertEqual(len(expected), len(found))
+        self.assertEqual(expected, set(found))
+
+    def test_query(self):
+        random.seed(6)
+        boxes = [randomBox(10) for i in range(200)]
+        index = GridIndex(cellSize=7)
+        for i, box in enumerate(boxes):
+            index.insert(i, box)
+
+        for window in [randomBox(20) for i in range(20)] + [(-50, -50, 200, 200)]:
+            expected = [i for i in range(len(boxes)) if overlaps(boxes[i], window)]
+            self.assertEqual(expected, sorted(index.query(window)))
+
+    def test_remove(self):
+        index = GridIndex(cellSize=2)
+        index.insert('a', (0, 0, 3, 3))
+        index.insert('b', (2, 2, 5, 5))
+        index.insert('c', (10, 10, 11, 11))
+        self.assertEqual([('a', 'b')], [tuple(sorted(p)) for p in index.pairs()])
+
+        index.remove('b')
+        self.assertNotIn('b', index)
+        self.assertEqual([], index.pairs())
+        self.assertEqual(['a'], index.query((1, 1, 4, 4)))
+        with self.assertRaises(KeyError):
+            index.remove('b')
+
+        # re-inserting moves the entry
+        index.insert('c', (1, 1, 2, 2))
+        self.assertEqual([('a', 'c')], [tuple(sorted(p)) for p in index.pairs()])
+
+    def test_mixedSizes(self):
+        """A box far larger than the cells doesn't fill the grid."""
+        index = GridIndex()
+        index.insert('a', (0, 0, .01, .01))
+        index.insert('b', (0, 0, 30, 30))
+        index.insert('c', (-40, -40, 40, 40))
+        index.insert('d', (31, 31, 31.005, 31.005))
+        self.assertLess(len(index.cells), 10)
+        self.assertEqual([('a', 'b'), ('a', 'c'), ('b', 'c'), ('c', 'd')],
+                         sorted(tuple(sorted(p)) for p in index.pairs()))
+        self.assertEqual(['b', 'c'], sorted(index.query((20, 20, 21, 21))))
+
+        index.remove('c')
+        self.assertEqual([('a', 'b')], [tuple(sorted(p)) for p in index.pairs()])
+
+        random.seed(8)
+        boxes = [randomBox(random.choice([0.1, 1, 100])) for i in range(200)]
+        index = GridIndex()
+        for i, box in enumerate(boxes):
+            index.insert(i, box)
+        expected = set()
+        for i in range(len(boxes)-1):
+            for j in range(i+1, len(boxes)):
+                if overlaps(boxes[i], boxes[j]):
+                    expected.add((i, j))
+        found = [tuple(sorted(pair)) for pair in index.pairs()]
+        self.assertEqual(len(expected), len(found))
+        self.assertEqual(expected, set(found))
+        for window in [randomBox(20) for i in range(20)]:
+            expected = [i for i in range(len(boxes)) if overlaps(boxes[i], window)]
+            self.assertEqual(expected, sorted(index.query(window)))
+
+    def test_polygons(self):
+        p = Polygon([Point(0, 0), Point(4, 0), Point(0, 4)])
+        q = Polygon([Point(3, 3), Point(8, 3), Point(3, 8)])
+        r = Polygon([Point(20, 20), Point(24, 20), Point(20, 24)])
+        polygons = [p, q, r]
+        index = GridIndex()
+        index.load((i, poly.bounds()) for i, poly in enumerate(polygons))
+        self.assertEqual([(0, 1)], [tuple(sorted(pair)) for pair in index.pairs()])
@@ -0,0 +1,79 @@
+import unittest
+
+from poly.point import Point
+from poly.polygon import Polygon
+from poly.sweep import findIntersection, findIntersections, findSplitPoints, crossing
+
+import random
+
+def bruteForce(segments):
+    """Compare every pair of segments."""
+    found = []
+    for i in range(len(segments)-1):
+        for j in range(i+1, len(segments)):
+            if crossing(segments[i], segments[j]) is not None:
+                found.append((i, j))
+    return found
+
+class TestSweep(unittest.TestCase):
+
+    def test_bowtie(self):
+        p = Polygon([Point(0, 0),
+                     Point(4, 4),
+                     Point(4, 0),
+                     Point(0, 4)])
+        self.assertFalse(p.simple())
+        self.assertEqual([(0, 2)], p.selfIntersections())
+
+    def test_simpleHasNoIntersections(self):
+        p = Polygon([Point(0, 0),
+                     Point(4, 0),
+                     Point(4, 4),
+                     Point(0, 4)])
+        self.assertTrue(p.simple())
+        self.assertEqual([], p.selfIntersections())
+
+    def test_touchingVertex(self):
+        """A vertex resting on another edge counts as intersection."""
+        p = Polygon([Point(0, 0),
+                     Point(8, 0),
+                     Point(8, 4),
+                     Point(4, 0),
+                     Point(0, 4)])
+        self.assertFalse(p.simple())
+
+    def test_groups(self):
+        """Only report intersections between different groups."""
+        segments = [(0, 0, 4, 4), (0, 4, 4, 0), (0, 2, 4, 2)]
+        self.assertEqual([(0, 1), (0, 2), (1, 2)], findIntersections(segments))
+        self.assertEqual([(0, 2), (1, 2)], findIntersections(segments, [0, 0, 1]))
+        self.assertIsNone(findIntersection(segments[:2], [0, 0]))
+
+    def test_splitPoints(self):
+        """Crossings, vertices resting on segments and overlaps split segments."""
+        segments = [(0, 0, 8, 0), (2, -2, 2, 2), (4, 0, 6, 2), (7, 0, 10, 0)]
+        self.assertEqual([[(2, 0), (4, 0), (7, 0)], [(2, 0)], [], [(8, 0)]],
+                         findSplitPoints(segments))
+
+    def test_identicalPoints(self):
+        with self.assertRaises(ValueError):
+            findIntersection([(1, 1, 1, 1)])
+
+    def test_randomAgainstBruteForce(self):
+        """Degenerate integer polygons must match the quadratic check."""
+        random.seed(11)
+        for trial in range(500):
+            n = random.randint(3, 20)
+            g = random.choice([4, 10, 100])
+            pts = []
+            for i in range(n):
+                pt = Point(random.randint(0, g), random.randint(0, g))
+                if not pts or pts[-1] != pt:
+                    pts.append(pt)
+            p = Polygon(pts)
+            if not p.valid() or p.get(0) == p.get(-1):
+                continue
+
+            expected = bruteForce(p.segments())
+            self.assertEqual(expected, p.selfIntersections())
+            self.assertEqual(not expected, p.simple())
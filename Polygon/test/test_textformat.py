@@ -0,0 +1,61 @@
+import unittest
+
+from poly.point import Point
+from poly.polygon import Polygon
+from poly.textformat import readWKT, readWKTString, writeWKT
+from poly.textformat import readGeoJSON, writeGeoJSON, GeoJSONWriter
+from hull.convex import computeRandom
+
+import io
+import json
+import random
+
+class TestTextFormat(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(13)
+        self.polygons = [computeRandom(0, 0, 100, 100) for i in range(30)]
+        self.polygons[0].get(0).set(0.1, 1/3)
+
+    def test_wktRoundTrip(self):
+        f = io.StringIO()
+        writeWKT(f, self.polygons + [None])
+        for chunk in [5, 1000]:
+            found = list(readWKT(io.StringIO(f.getvalue()), chunk))
+            self.assertEqual(self.polygons, found[:-1])
+            self.assertEqual(0, found[-1].numPoints())
+
+    def test_wktSubset(self):
+        text = ('POINT (1 2) MULTIPOLYGON (((0 0, 1 0, 0 1, 0 0)), ((5 5, 6 5, 5 6, 5 5))),'
+                'GEOMETRYCOLLECTION (POLYGON Z ((0 0 1, 4 0 1, 0 4 1, 0 0 1)))')
+        found = list(readWKTString(text))
+        self.assertEqual([Polygon([Point(0, 0), Point(1, 0), Point(0, 1)]),
+                          Polygon([Point(5, 5), Point(6, 5), Point(5, 6)]),
+                          Polygon([Point(0, 0), Point(4, 0), Point(0, 4)])], found)
+
+        with self.assertRaises(ValueError):
+            list(readWKTString('POLYGON ((0 0, 4 0, 0 4, 0 0), (1 1, 2 1, 1 2, 1 1))'))
+        with self.assertRaises(ValueError):
+            list(readWKTString('POLYGON ((0 0, 4 0'))
+
+    def test_geoJSONRoundTrip(self):
+        f = io.StringIO()
+        with GeoJSONWriter(f) as writer:
+            for p in self.polygons:
+                writer.write(p, {'points': p.numPoints()})
+        self.assertEqual(len(self.polygons), len(json.loads(f.getvalue())['features']))
+        for chunk in [5, 1000]:
+            found = list(readGeoJSON(io.StringIO(f.getvalue()), chunk))
+            self.assertEqual(self.polygons, found)
+
+    def test_geoJSONPerLine(self):
+        f = io.StringIO()
+        for p in self.polygons:
+            geometry = {'type': 'Polygon',
+                        'coordinates': [[[pt.x(), pt.y()] for pt in p]]}
+            f.write(json.dumps({'type': 'Feature', 'geometry': geometry}) + '\n')
+        self.assertEqual(self.polygons, list(readGeoJSON(io.StringIO(f.getvalue()), 7)))
+
+        f = io.StringIO()
+        writeGeoJSON(f, [None])
+        self.assertEqual([Polygon()], list(readGeoJSON(io.StringIO(f.getvalue()))))
@@ -0,0 +1,97 @@
+import unittest
+
+import poly.util
+from poly.util import intersect, intersectMany, intersectExact, orient2d
+
+from fractions import Fraction
+
+import random
+
+def segments(n, g):
+    """Random segments with coordinates from grid of size g."""
+    found = []
+    while len(found) < n:
+        s = (random.randint(0, g), random.randint(0, g),
+             random.randint(0, g), random.randint(0, g))
+        if s[:2] != s[2:]:
+            found.append(s)
+    return found
+
+class TestUtil(unittest.TestCase):
+
+    def check(self, first, second, chunk):
+        """Compare intersectMany against intersect on each pair."""
+        pairs, points = intersectMany(first, second, chunk)
+        expected = []
+        for i in range(len(first)):
+            for j in range(len(second)):
+                pt = intersect(*(first[i] + second[j]))
+                if pt is not None:
+                    expected.append(((i, j), pt))
+        self.assertEqual([e[0] for e in expected], pairs)
+        self.assertEqual([e[1] for e in expected], points)
+
+    def test_intersectMany(self):
+        random.seed(7)
+        first = segments(40, 10)
+        second = segments(30, 10)
+        second.append((0.5, 0.5, 2.5, 1.5))
+        self.check(first, second, 1<<20)
+        self.check(first, second, 50)
+        self.check(first, [], 50)
+
+    def test_intersectManyWithoutNumPy(self):
+        random.seed(8)
+        saved = poly.util.numpy
+        poly.util.numpy = None
+        try:
+            self.check(segments(20, 6), segments(25, 6), 1<<20)
+        finally:
+            poly.util.numpy = saved
+
+    def test_parallel(self):
+        pairs, points = intersectMany([(0, 0, 4, 0)], [(0, 1, 4, 1), (2, -1, 2, 1)])
+        self.assertEqual([(0, 1)], pairs)
+        self.assertEqual([(2, 0)], points)
+
+    def test_orient2d(self):
+        """Exact sign even where floating point determinant is wrong."""
+        random.seed(9)
+        ulp = 2.0**-53
+        for trial in range(2000):
+            pts = [0.5 + random.randint(0, 64)*ulp for i in range(6)]
+            x1, y1, x2, y2, x3, y3 = [Fraction(v) for v in pts]
+            det = (x2 - x1)*(y3 - y1) - (y2 - y1)*(x3 - x1)
+            expected = (det > 0) - (det < 0)
+            self.assertEqual(expected, orient2d(*pts))
+
+        # collinear, and a turn too small for epsilon to see
+        self.assertEqual(0, orient2d(1E9, 3E8, 2E9, 6E8, 3E9, 9E8))
+        self.assertEqual(+1, orient2d(0, 0, 1E-12, 0, 0, 1E-12))
+
+    def test_robust(self):
+        random.seed(10)
+        saved = poly.util.robust
+        poly.util.robust = True
+        try:
+            self.assertEqual(+1, poly.util.computeAngleSign(0, 0, 1E-12, 0, 0, 1E-12))
+            self.assertEqual((1E-12, 0), intersect(0, 0, 2E-12, 0, 1E-12, -1E-12, 1E-12, 1E-12))
+            self.assertIsNone(intersect(0, 0, 2E-12, 0, 0, 1E-12, 2E-12, 1E-12))
+            self.check(segments(20, 6), segments(25, 6), 1<<20)
+        finally:
+            poly.util.robust = saved
+        self.assertIsNone(intersect(0, 0, 2E-12, 0, 1E-12, -1E-12, 1E-12, 1E-12))
+
+    def test_intersectExact(self):
+        self.assertEqual((Fraction(3, 2), Fraction(1, 2)), intersectExact(0, 0, 3, 1, 0, 1, 3, 0))
+        self.assertEqual((2, 0), intersectExact(0, 0, 4, 0, 2, -1, 2, 0))
+        self.assertIsNone(intersectExact(0, 0, 4, 0, 0, 1, 4, 1))
+        self.assertIsNone(intersectExact(0, 0, 4, 0, 5, -1, 5, 1))
+        self.assertEqual((Fraction(18, 11), Fraction(8, 11)), intersectExact(0.5, 0.5, 3, 1, 0, 1, 3, 0.5))
+
+        random.seed(11)
+        for s in segments(20, 6):
+            for t in segments(20, 6):
+                pt = intersectExact(*(s + t))
+                expected = intersect(*(s + t))
+                self.assertEqual(expected is None, pt is None)